@@ -2,17 +2,45 @@
 Generate a Plaid sandbox access token for testing
 """
 import os
-import requests
-import json
+import time
+
+from src.banking_api import json_dumps, json_loads, make_retry_session
 
 # Your credentials
 CLIENT_ID = os.getenv("PLAID_CLIENT_ID", "699208264c01cb002166c676")
 SECRET = os.getenv("PLAID_SECRET", "4fd746dbc01da40fa0595279a003e1")
 ENVIRONMENT = "sandbox"
 
+TOKEN_FILE = "access_token.txt"
+TOKEN_MAX_AGE_DAYS = 30  # Sandbox tokens don't expire; regenerate monthly anyway
+
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (3.05, 10)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def load_cached_token():
+    """Return the saved access token if it is recent enough to reuse"""
+    try:
+        age_days = (time.time() - os.path.getmtime(TOKEN_FILE)) / 86400
+        if age_days >= TOKEN_MAX_AGE_DAYS:
+            return None
+        with open(TOKEN_FILE, "r") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
 def get_access_token():
     """Generate a test access token"""
     
+    cached_token = load_cached_token()
+    if cached_token:
+        print(f"✅ Reusing access token from {TOKEN_FILE}: {cached_token[:20]}...")
+        return cached_token
+    
+    # One kept-alive connection for both calls; the POSTs are not replayed on errors
+    session = make_retry_session()
+    
     # Step 1: Create a public token
     print("📌 Step 1: Creating public token...")
     
@@ -25,11 +53,17 @@ def get_access_token():
     }
     
     try:
-        response = requests.post(public_token_url, json=public_token_payload)
+        response = session.post(
+            public_token_url,
+            data=json_dumps(public_token_payload),
+            headers=JSON_HEADERS,
+            timeout=REQUEST_TIMEOUT,
+        )
         response.raise_for_status()
-        public_token = response.json().get("public_token")
+        data = json_loads(response.content)
+        public_token = data.get("public_token")
         if not public_token:
-            print(f"❌ No public token in response: {response.json()}")
+            print(f"❌ No public token in response: {data}")
             return
         print(f"✅ Public token created: {public_token[:20]}...")
     except Exception as e:
@@ -49,9 +83,14 @@ def get_access_token():
     }
     
     try:
-        response = requests.post(exchange_url, json=exchange_payload)
+        response = session.post(
+            exchange_url,
+            data=json_dumps(exchange_payload),
+            headers=JSON_HEADERS,
+            timeout=REQUEST_TIMEOUT,
+        )
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
         access_token = data.get("access_token")
         
         if access_token:
@@ -62,9 +101,9 @@ def get_access_token():
             print("=" * 60 + "\n")
             
             # Save to file for easy reference
-            with open("access_token.txt", "w") as f:
+            with open(TOKEN_FILE, "w") as f:
                 f.write(access_token)
-            print(f"✅ Token saved to access_token.txt")
+            print(f"✅ Token saved to {TOKEN_FILE}")
             print(f"✅ Token length: {len(access_token)} characters\n")
             
             return access_token
@@ -6,15 +6,95 @@ transformer-based models (BERT, DistilBERT, etc.)
 """
 
 import os
-from typing import Dict, Tuple, List
+import re
+import copy
+import contextlib
+import importlib.util
+from collections import OrderedDict
+from typing import Dict, Tuple, List, Optional
 import numpy as np
 
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-    from sentence_transformers import SentenceTransformer, util
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+# Checked without importing: torch and transformers take seconds to import,
+# so they are only imported once models are actually loaded
+TRANSFORMERS_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("torch", "transformers", "sentence_transformers")
+)
+
+# FAISS gives BLAS-backed batched inner-product search for bulk categorization;
+# like the transformer stack it is only imported in load_models()
+FAISS_AVAILABLE = importlib.util.find_spec("faiss") is not None
+
+# Set by _import_transformers() on first use
+torch = None
+pipeline = None
+SentenceTransformer = None
+util = None
+
+
+def _import_transformers():
+    """Import the transformer stack on first call and memoize it in module globals."""
+    global torch, pipeline, SentenceTransformer, util
+    if SentenceTransformer is None:
+        import torch as _torch
+        from transformers import pipeline as _pipeline
+        from sentence_transformers import SentenceTransformer as _SentenceTransformer, util as _util
+        torch, pipeline, SentenceTransformer, util = _torch, _pipeline, _SentenceTransformer, _util
+    return pipeline, SentenceTransformer, util
+
+# Sentence-embedding model used for intent routing and semantic similarity
+SEMANTIC_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Dynamically quantized INT8 ONNX export of the semantic model, used on CPU
+# in place of the PyTorch weights once export_quantized_semantic_model() has run
+ONNX_MODEL_DIR = os.getenv(
+    "SEMANTIC_MODEL_ONNX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "minilm-onnx-int8")
+)
+ONNX_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Token-classification model used for entity extraction when the
+# USE_NER_TRANSFORMER environment variable is set
+NER_MODEL_NAME = "dslim/bert-base-NER"
+
+# Default entity extraction: amounts and dates are all financial queries carry.
+# DATE comes first so ISO dates are not split into amounts.
+_MONEY_DATE_RE = re.compile(
+    r"(?P<DATE>\b(?:last|this|next)\s+(?:week|month|year)\b|\b\d{4}-\d{2}-\d{2}\b)"
+    r"|(?P<AMT>[£$€]?\d+(?:,\d{3})*(?:\.\d+)?)",
+    re.I
+)
+
+# Semantic route cache: queries at least this similar to a cached query
+# reuse its route, and the cache holds at most this many queries
+SEMANTIC_CACHE_THRESHOLD = 0.87
+SEMANTIC_CACHE_SIZE = 512
+
+# Exact-match memo of routed/summarized queries (keyed on normalized text)
+ROUTE_CACHE_SIZE = 1024
+
+# Exact description -> category cache for recurring merchant descriptions
+CATEGORY_CACHE_SIZE = 4096
+
+
+def export_quantized_semantic_model(output_dir: str = ONNX_MODEL_DIR) -> str:
+    """
+    Export the semantic model to ONNX with dynamic INT8 quantization.
+    
+    Run once at install time (requires optimum[onnxruntime]); the engine
+    loads the export from ONNX_MODEL_DIR afterwards.
+    
+    :param output_dir: Directory to write the exported model to
+    :return: Path of the quantized ONNX file
+    """
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+    
+    _import_transformers()
+    model = SentenceTransformer(SEMANTIC_MODEL_NAME, backend="onnx")
+    model.save(output_dir)
+    export_dynamic_quantized_onnx_model(model, "avx512_vnni", output_dir)
+    
+    return os.path.join(output_dir, ONNX_MODEL_FILE)
 
 
 class TransformerNLPEngine:
@@ -26,13 +106,18 @@ class TransformerNLPEngine:
     - Text summarization
     """
     
-    def __init__(self, use_gpu: bool = False):
+    def __init__(self, use_gpu: bool = False, use_transformers: bool = True):
         """
         Initialize transformer-based NLP models with lazy loading.
-        Models are only loaded when explicitly needed.
+        Models (and the transformer libraries) are only loaded when explicitly needed.
         
         :param use_gpu: Use GPU acceleration if available
+        :param use_transformers: Allow loading transformer models; False keeps the engine keyword-only
         """
+        self.use_transformers = use_transformers and TRANSFORMERS_AVAILABLE
+        # Description -> category LRU cache (set up first: the cache helpers
+        # work even when the models are unavailable)
+        self._category_cache = OrderedDict()
         if not TRANSFORMERS_AVAILABLE:
             print("⚠️  Transformers not available. Using keyword-based fallback only.")
             self.models_loaded = False
@@ -40,9 +125,10 @@ class TransformerNLPEngine:
         
         self.device = 0 if use_gpu else -1  # -1 for CPU
         self.models_loaded = False
-        self.intent_classifier = None
         self.semantic_model = None
+        self.intent_embeddings = None
         self.ner_pipeline = None
+        self._use_bf16 = False
         
         # Models will be loaded lazily when needed
         # This prevents app startup delays
@@ -57,27 +143,136 @@ class TransformerNLPEngine:
             "budgeting",
             "account overview"
         ]
+        
+        # Transaction category labels, embedded once in load_models()
+        self._category_labels = [
+            "groceries",
+            "restaurants",
+            "transportation",
+            "utilities",
+            "entertainment",
+            "shopping",
+            "healthcare",
+            "insurance",
+            "savings",
+            "other"
+        ]
+        self._category_embs = None
+        self._cat_index = None
+    
+    def load_models(self) -> bool:
+        """
+        Load the sentence-embedding and NER models.
+        
+        Intent labels are embedded once here so that intent classification
+        only needs to encode the query itself.
+        
+        :return: True if the models were loaded
+        """
+        if not self.use_transformers:
+            return False
+        if self.models_loaded:
+            return True
+        
+        try:
+            _import_transformers()
+            self.semantic_model = self._load_semantic_model()
+            
+            # BF16 weights halve memory traffic on CPUs with native BF16 GEMM
+            supports_bf16 = getattr(torch.cpu, "_is_cpu_support_avx512_bf16", lambda: False)
+            if (self.device < 0 and getattr(self.semantic_model, "backend", "torch") == "torch"
+                    and supports_bf16()):
+                self.semantic_model = self.semantic_model.to(torch.bfloat16)
+                self._use_bf16 = True
+            
+            with self._inference():
+                self.intent_embeddings = self.semantic_model.encode(
+                    self.financial_intents,
+                    convert_to_tensor=True,
+                    normalize_embeddings=True
+                )
+                self._category_embs = self.semantic_model.encode(
+                    self._category_labels,
+                    convert_to_tensor=True,
+                    normalize_embeddings=True
+                )
+            if FAISS_AVAILABLE:
+                import faiss
+                category_matrix = self._category_embs.float().cpu().numpy()
+                self._cat_index = faiss.IndexFlatIP(category_matrix.shape[1])
+                self._cat_index.add(category_matrix)
+            if os.getenv("USE_NER_TRANSFORMER"):
+                self.ner_pipeline = pipeline(
+                    "ner",
+                    model=NER_MODEL_NAME,
+                    aggregation_strategy="simple",
+                    device=self.device
+                )
+            self.models_loaded = True
+        except Exception as e:
+            print(f"❌ Failed to load transformer models: {e}")
+            self.models_loaded = False
+        
+        return self.models_loaded
+    
+    def _load_semantic_model(self):
+        """Load the quantized ONNX semantic model on CPU if exported, else the PyTorch one."""
+        device = "cuda" if self.device >= 0 else "cpu"
+        
+        if device == "cpu" and os.path.exists(os.path.join(ONNX_MODEL_DIR, ONNX_MODEL_FILE)):
+            try:
+                return SentenceTransformer(
+                    ONNX_MODEL_DIR,
+                    backend="onnx",
+                    model_kwargs={"file_name": ONNX_MODEL_FILE}
+                )
+            except Exception as e:
+                print(f"⚠️  Quantized ONNX model unavailable ({e}). Using PyTorch weights.")
+        
+        return SentenceTransformer(SEMANTIC_MODEL_NAME, device=device)
+    
+    def _inference(self):
+        """Context for model calls: no autograd, plus BF16 autocast when enabled."""
+        stack = contextlib.ExitStack()
+        stack.enter_context(torch.inference_mode())
+        if self._use_bf16:
+            stack.enter_context(torch.autocast(device_type="cpu", dtype=torch.bfloat16))
+        return stack
+    
+    def encode_query(self, query: str):
+        """
+        Embed a query with the semantic model.
+        
+        :param query: Query text
+        :return: Normalized query embedding tensor
+        """
+        with self._inference():
+            return self.semantic_model.encode(
+                query,
+                convert_to_tensor=True,
+                normalize_embeddings=True
+            )
     
-    def classify_intent(self, query: str, threshold: float = 0.3) -> Tuple[str, float]:
+    def classify_intent(self, query: str, threshold: float = 0.3, *, query_emb=None) -> Tuple[str, float]:
         """
-        Classify the intent of a user query using zero-shot classification.
+        Classify the intent of a user query by cosine similarity between the
+        query embedding and the precomputed intent label embeddings.
         
         :param query: User query text
         :param threshold: Confidence threshold
+        :param query_emb: Precomputed query embedding (from encode_query) to reuse
         :return: Tuple of (intent, confidence)
         """
-        if not self.models_loaded or not self.intent_classifier:
+        if not self.models_loaded or self.intent_embeddings is None:
             return "unknown", 0.0
             
         try:
-            result = self.intent_classifier(
-                query,
-                self.financial_intents,
-                multi_class=False
-            )
+            query_embedding = query_emb if query_emb is not None else self.encode_query(query)
+            with self._inference():
+                scores = util.pytorch_cos_sim(query_embedding, self.intent_embeddings)[0]
             
-            intent = result['labels'][0]
-            confidence = result['scores'][0]
+            intent = self.financial_intents[int(scores.argmax())]
+            confidence = float(scores.max())
             
             if confidence < threshold:
                 return "unknown", confidence
@@ -88,19 +283,69 @@ class TransformerNLPEngine:
             print(f"❌ Intent classification error: {e}")
             return "unknown", 0.0
     
-    def find_semantic_similarity(self, query: str, candidates: List[str]) -> List[Tuple[str, float]]:
+    def classify_intent_batch(self, queries: List[str], threshold: float = 0.3, batch_size: int = 32) -> List[Tuple[str, float]]:
+        """
+        Classify the intents of many queries with one batched encode and one
+        query-by-intent similarity matrix.
+        
+        :param queries: User query texts
+        :param threshold: Confidence threshold
+        :param batch_size: Encoder batch size
+        :return: List of (intent, confidence), one per query
+        """
+        if not self.models_loaded or self.intent_embeddings is None:
+            return [("unknown", 0.0)] * len(queries)
+        if not queries:
+            return []
+        
+        try:
+            with self._inference():
+                query_embeddings = self.semantic_model.encode(
+                    list(queries),
+                    convert_to_tensor=True,
+                    normalize_embeddings=True,
+                    batch_size=batch_size
+                )
+                scores = util.pytorch_cos_sim(query_embeddings, self.intent_embeddings)
+                confidences, best = scores.max(dim=1)
+            
+            return [
+                (self.financial_intents[int(i)] if float(c) >= threshold else "unknown", float(c))
+                for i, c in zip(best, confidences)
+            ]
+            
+        except Exception as e:
+            print(f"❌ Intent classification error: {e}")
+            return [("unknown", 0.0)] * len(queries)
+    
+    def find_semantic_similarity(self, query: str, candidates: List[str], *, query_emb=None) -> List[Tuple[str, float]]:
         """
         Find the most semantically similar candidates to the query.
         
         :param query: Query text
         :param candidates: List of candidate texts to compare
+        :param query_emb: Precomputed query embedding (from encode_query) to reuse
         :return: List of (candidate, similarity_score) sorted by similarity
         """
         try:
-            query_embedding = self.semantic_model.encode(query, convert_to_tensor=True)
-            candidate_embeddings = self.semantic_model.encode(candidates, convert_to_tensor=True)
-            
-            similarities = util.pytorch_cos_sim(query_embedding, candidate_embeddings)[0]
+            with self._inference():
+                if query_emb is not None:
+                    candidate_embeddings = self.semantic_model.encode(
+                        list(candidates),
+                        convert_to_tensor=True,
+                        normalize_embeddings=True,
+                        batch_size=64
+                    )
+                    similarities = util.pytorch_cos_sim(query_emb, candidate_embeddings)[0]
+                else:
+                    # One batched forward pass for the query and all candidates
+                    embeddings = self.semantic_model.encode(
+                        [query] + list(candidates),
+                        convert_to_tensor=True,
+                        normalize_embeddings=True,
+                        batch_size=64
+                    )
+                    similarities = util.pytorch_cos_sim(embeddings[0:1], embeddings[1:])[0]
             
             results = [
                 (candidates[i], float(similarities[i]))
@@ -113,19 +358,100 @@ class TransformerNLPEngine:
             print(f"❌ Semantic similarity error: {e}")
             return [(c, 0.0) for c in candidates]
     
-    def extract_entities(self, text: str) -> List[Dict]:
+    def encode_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
         """
-        Extract named entities from text (amounts, dates, categories, etc.)
+        Embed texts once for reuse, e.g. a fixed candidate list ranked
+        against many queries.
         
-        :param text: Input text
-        :return: List of entities with their types and positions
+        :param texts: Texts to embed
+        :param batch_size: Encoder batch size
+        :return: Normalized float32 embeddings, one row per text, or None
+                 if the models are not loaded
         """
+        if not self.models_loaded:
+            return None
+        
+        with self._inference():
+            embeddings = self.semantic_model.encode(
+                list(texts),
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+                batch_size=batch_size
+            )
+        return embeddings.float().cpu().numpy()
+    
+    def find_semantic_similarity_batch(self, queries: List[str], candidates: List[str], batch_size: int = 32,
+                                       *, candidate_embs: Optional[np.ndarray] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Rank the candidates for many queries with one batched encode and one
+        query-by-candidate cosine matrix.
+        
+        :param queries: Query texts
+        :param candidates: List of candidate texts to compare
+        :param batch_size: Encoder batch size
+        :param candidate_embs: Precomputed candidate embeddings (from encode_texts) to reuse
+        :return: For each query, a list of (candidate, similarity_score) sorted by similarity
+        """
+        if not self.models_loaded:
+            return [[(c, 0.0) for c in candidates] for _ in queries]
+        
         try:
-            entities = self.ner_pipeline(text)
-            return entities
+            if candidate_embs is None:
+                embeddings = self.encode_texts(list(queries) + list(candidates), batch_size=batch_size)
+                query_embs, candidate_embs = embeddings[:len(queries)], embeddings[len(queries):]
+            else:
+                query_embs = self.encode_texts(queries, batch_size=batch_size)
+            similarities = query_embs @ candidate_embs.T
+            
+            return [
+                sorted(zip(candidates, map(float, row)), key=lambda x: x[1], reverse=True)
+                for row in similarities
+            ]
+            
         except Exception as e:
-            print(f"❌ NER error: {e}")
-            return []
+            print(f"❌ Semantic similarity error: {e}")
+            return [[(c, 0.0) for c in candidates] for _ in queries]
+    
+    def extract_entities(self, text: str) -> List[Dict]:
+        """
+        Extract amount and date entities from text with a compiled regex.
+        The transformer NER model is used instead when USE_NER_TRANSFORMER is set.
+        
+        :param text: Input text
+        :return: List of entities with 'word' and 'entity_group' keys
+        """
+        if getattr(self, "ner_pipeline", None) is not None:
+            try:
+                with self._inference():
+                    entities = self.ner_pipeline(text)
+                return entities
+            except Exception as e:
+                print(f"❌ NER error: {e}")
+                return []
+        
+        return [
+            {"word": m.group(), "entity_group": m.lastgroup}
+            for m in _MONEY_DATE_RE.finditer(text)
+        ]
+    
+    def extract_entities_batch(self, texts: List[str], batch_size: int = 16) -> List[List[Dict]]:
+        """
+        Extract entities from many texts; the transformer NER model (when
+        enabled) runs them through the pipeline in batches.
+        
+        :param texts: Input texts
+        :param batch_size: NER pipeline batch size
+        :return: For each text, a list of entities with 'word' and 'entity_group' keys
+        """
+        if getattr(self, "ner_pipeline", None) is not None and texts:
+            try:
+                with self._inference():
+                    return self.ner_pipeline(list(texts), batch_size=batch_size)
+            except Exception as e:
+                print(f"❌ NER error: {e}")
+                return [[] for _ in texts]
+        
+        return [self.extract_entities(text) for text in texts]
     
     def categorize_transaction_description(self, description: str) -> str:
         """
@@ -134,21 +460,72 @@ class TransformerNLPEngine:
         :param description: Transaction description
         :return: Predicted category
         """
-        categories = [
-            "groceries",
-            "restaurants",
-            "transportation",
-            "utilities",
-            "entertainment",
-            "shopping",
-            "healthcare",
-            "insurance",
-            "savings",
-            "other"
-        ]
+        if not self.models_loaded:
+            return "other"
+        
+        # Exact-description cache only. A near-duplicate index of seen
+        # descriptions would still need this encode to query it, and the
+        # encode is the whole cost: the label match after it is a cosine
+        # against the ten category embeddings.
+        category = self._category_cache_get(description)
+        if category is not None:
+            return category
+        
+        description_embedding = self.encode_query(description)
+        with self._inference():
+            idx = int(util.pytorch_cos_sim(description_embedding, self._category_embs).argmax())
+        category = self._category_labels[idx]
+        self._category_cache_put(description, category)
+        return category
+    
+    def categorize_batch(self, descriptions: List[str]) -> List[str]:
+        """
+        Categorize many transaction descriptions with one batched encode
+        and one batched nearest-category search (FAISS when available).
         
-        similarities = self.find_semantic_similarity(description, categories)
-        return similarities[0][0]  # Return top match
+        :param descriptions: Transaction descriptions
+        :return: Predicted category for each description
+        """
+        if not self.models_loaded:
+            return ["other"] * len(descriptions)
+        if not descriptions:
+            return []
+        
+        # Only encode distinct descriptions that are not already cached
+        results = [self._category_cache_get(d) for d in descriptions]
+        misses = list(dict.fromkeys(d for d, r in zip(descriptions, results) if r is None))
+        if misses:
+            with self._inference():
+                description_embeddings = self.semantic_model.encode(
+                    misses,
+                    convert_to_tensor=True,
+                    normalize_embeddings=True,
+                    batch_size=64
+                )
+                if self._cat_index is not None:
+                    _, nearest = self._cat_index.search(description_embeddings.float().cpu().numpy(), 1)
+                    best = nearest[:, 0]
+                else:
+                    best = util.pytorch_cos_sim(description_embeddings, self._category_embs).argmax(dim=1)
+            computed = {d: self._category_labels[int(i)] for d, i in zip(misses, best)}
+            for d, category in computed.items():
+                self._category_cache_put(d, category)
+            results = [r if r is not None else computed[d] for d, r in zip(descriptions, results)]
+        return results
+    
+    def _category_cache_get(self, description: str) -> Optional[str]:
+        """Return the cached category for a description, marking it recently used."""
+        category = self._category_cache.get(description)
+        if category is not None:
+            self._category_cache.move_to_end(description)
+        return category
+    
+    def _category_cache_put(self, description: str, category: str) -> None:
+        """Cache a description's category, evicting the least recently used."""
+        self._category_cache[description] = category
+        self._category_cache.move_to_end(description)
+        if len(self._category_cache) > CATEGORY_CACHE_SIZE:
+            self._category_cache.popitem(last=False)
     
     def summarize_query(self, query: str) -> str:
         """
@@ -191,28 +568,118 @@ class HybridNLPRouter:
             "SUMMARY": ["spend", "summary", "total", "overview"],
             "TREND": ["trend", "over time", "change", "increase", "decrease"],
         }
+        # One compiled alternation per route, tried in route order so the
+        # first route with any keyword in the query wins
+        self._route_res = [
+            (route, re.compile("|".join(re.escape(kw) for kw in keywords), re.I))
+            for route, keywords in self.keyword_routes.items()
+        ]
+        
+        # Semantic cache of transformer routes, in least-recently-used order.
+        # Rows of _cache_embs line up with _cache_keys.
+        self._cache = OrderedDict()
+        self._cache_keys = []
+        self._cache_embs = None
+        self._cache_next_key = 0
+        
+        # Per-instance LRU memos keyed on (normalized query, models loaded), so
+        # repeated prompts skip embedding entirely and loading the models
+        # later does not serve stale keyword routes
+        self._route_memo = OrderedDict()
+        self._summary_memo = OrderedDict()
+    
+    def _models_loaded(self) -> bool:
+        return bool(self.transformer_engine and self.transformer_engine.models_loaded)
+    
+    def _memoized(self, memo: OrderedDict, query: str, compute):
+        """
+        Look a query up in memo by its case- and whitespace-insensitive form,
+        computing it from the original text (the NER model is case-sensitive)
+        on a miss.
+        """
+        key = (query.strip().lower(), self._models_loaded())
+        if key in memo:
+            memo.move_to_end(key)
+            return memo[key]
+        
+        value = compute(query.strip())
+        memo[key] = value
+        if len(memo) > ROUTE_CACHE_SIZE:
+            memo.popitem(last=False)
+        return value
     
     def route_query(self, query: str) -> Tuple[str, Dict]:
         """
         Route a query to the appropriate analysis handler.
         
+        Repeats of a query (ignoring case and surrounding whitespace) are
+        answered from an exact-match memo; paraphrases of a previously routed
+        query are answered from the semantic cache instead of re-running
+        intent classification.
+        
         :param query: User query text
         :return: Tuple of (route_type, parameters)
         """
-        # Try transformer-based routing first
-        if self.transformer_engine:
-            return self._transformer_route(query)
-        else:
+        route_type, params = self._memoized(self._route_memo, query, self._route)
+        # Deep copy: the memoized params (and their entity list) stay private
+        return route_type, copy.deepcopy(params)
+    
+    def _route(self, query: str) -> Tuple[str, Dict]:
+        """Route a query without the exact-match memo (memoized by route_query)."""
+        if not self.transformer_engine or not self.transformer_engine.models_loaded:
             return self._keyword_route(query)
+        
+        # Embed the query exactly once; the cache and intent classification share it
+        try:
+            query_embedding = self.transformer_engine.encode_query(query)
+        except Exception as e:
+            print(f"⚠️  Query embedding failed: {e}. Falling back to keywords.")
+            return self._keyword_route(query)
+        
+        cached = self._cache_lookup(query_embedding)
+        if cached is not None:
+            route_type, params = cached
+            params = dict(params)
+            # Entities belong to the query, not the route
+            if "entities" in params:
+                params["entities"] = self.transformer_engine.extract_entities(query)
+            return route_type, params
+        
+        result = self._transformer_route(query, query_emb=query_embedding)
+        self._cache_store(query_embedding, result)
+        return result
+    
+    def _cache_lookup(self, query_embedding) -> Optional[Tuple[str, Dict]]:
+        """Return the cached route of the most similar cached query, if close enough."""
+        if self._cache_embs is None:
+            return None
+        
+        similarities = util.pytorch_cos_sim(query_embedding, self._cache_embs)[0]
+        if float(similarities.max()) < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        
+        key = self._cache_keys[int(similarities.argmax())]
+        self._cache.move_to_end(key)
+        return self._cache[key][1]
+    
+    def _cache_store(self, query_embedding, result: Tuple[str, Dict]) -> None:
+        """Add a routed query to the semantic cache, evicting the least recently used."""
+        self._cache[self._cache_next_key] = (query_embedding, result)
+        self._cache_next_key += 1
+        if len(self._cache) > SEMANTIC_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        
+        self._cache_keys = list(self._cache.keys())
+        self._cache_embs = torch.stack([emb for emb, _ in self._cache.values()])
     
-    def _transformer_route(self, query: str) -> Tuple[str, Dict]:
+    def _transformer_route(self, query: str, query_emb=None) -> Tuple[str, Dict]:
         """Route using transformer models, with fallback to keywords."""
         # Check if transformer models are available
         if not self.transformer_engine or not self.transformer_engine.models_loaded:
             return self._keyword_route(query)
         
         try:
-            intent, confidence = self.transformer_engine.classify_intent(query)
+            intent, confidence = self.transformer_engine.classify_intent(query, query_emb=query_emb)
             
             # If confidence too low, fall back to keywords
             if intent == "unknown" or confidence < 0.3:
@@ -249,10 +716,8 @@ class HybridNLPRouter:
     
     def _keyword_route(self, query: str) -> Tuple[str, Dict]:
         """Fallback keyword-based routing."""
-        q = query.lower()
-        
-        for route_type, keywords in self.keyword_routes.items():
-            if any(kw in q for kw in keywords):
+        for route_type, pattern in self._route_res:
+            if pattern.search(query):
                 return route_type, {}
         
         return "UNKNOWN", {}
@@ -260,5 +725,5 @@ class HybridNLPRouter:
     def get_query_summary(self, query: str) -> str:
         """Get a summary of what was understood from the query."""
         if self.transformer_engine:
-            return self.transformer_engine.summarize_query(query)
+            return self._memoized(self._summary_memo, query, self.transformer_engine.summarize_query)
         return query
@@ -1,47 +1,142 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
 from sklearn.ensemble import IsolationForest
+from sklearn.exceptions import NotFittedError
+from anomaly_kernels import score_z
 
-def train_anomaly_model(df):
-    model = IsolationForest(
-        contamination=0.05,
-        random_state=42,
-        n_estimators=200
-    )
-    model.fit(df[["amount"]])
+def _amounts(data):
+    # Accepts a transactions DataFrame or an (n,) / (n, 1) array of amounts
+    if isinstance(data, pd.DataFrame):
+        data = data["amount"].to_numpy(dtype=np.float32)
+    return np.ascontiguousarray(np.asarray(data, dtype=np.float32).reshape(-1))
+
+# Rows per chunk when IsolationForest scoring is spread over threads
+_IFOREST_CHUNK_ROWS = 10_000
+
+def _amount_matrix(df):
+    # IsolationForest works in float32 internally; convert once, contiguous
+    return _amounts(df).reshape(-1, 1)
+
+def train_anomaly_model(df, method="mad"):
+    model = AnomalyDetector(method=method)
+    model.fit(df)
     return model
 
-def score_transactions(model, df):
-    df = df.copy()
-    df["anomaly_score"] = model.decision_function(df[["amount"]])
-    df["is_anomaly"] = model.predict(df[["amount"]]) == -1
-    return df
+def score_transactions(model, df, inplace=True):
+    return model.score(df, inplace=inplace)
 
-# Class-based interface for anomaly detection
+# Class-based interface for anomaly detection.
+# "mad" (default) flags amounts whose median-absolute-deviation z-score falls in
+# the top `contamination` fraction: one sort instead of building a forest,
+# which on the single amount feature finds the same distribution tails.
+# "iforest" keeps IsolationForest for multivariate use. It stays on sklearn:
+# cuML has no IsolationForest and its FIL inference cannot load one.
 class AnomalyDetector:
-    def __init__(self, contamination=0.05, random_state=42, n_estimators=200):
-        self.model = IsolationForest(
-            contamination=contamination,
-            random_state=random_state,
-            n_estimators=n_estimators
-        )
+    def __init__(self, contamination=0.05, random_state=42, n_estimators=200, method="mad"):
+        if method not in ("mad", "iforest"):
+            raise ValueError(f"Unsupported method: {method}")
+        self.method = method
+        self.contamination = contamination
+        self.random_state = random_state
+        self.n_estimators = n_estimators
+        self.model = None
+        if method == "iforest":
+            self.model = IsolationForest(
+                contamination=contamination,
+                random_state=random_state,
+                n_estimators=n_estimators
+            )
         self.is_fitted = False
+        self._dtype = np.float32
+        self._split_thresholds = None
+        self._interval_is_anomaly = None
 
     def fit(self, df):
-        self.model.fit(df[["amount"]])
+        if self.method == "mad":
+            # Missing amounts would make every statistic NaN; fit on the rest
+            amounts = _amounts(df)
+            amounts = amounts[~np.isnan(amounts)]
+            if amounts.size == 0:
+                raise ValueError("Cannot fit the MAD detector: no non-missing amounts")
+            self._med = np.median(amounts)
+            self._mad = np.median(np.abs(amounts - self._med)) + 1e-9
+            self._cut = np.quantile(np.abs(amounts - self._med) / self._mad, 1 - self.contamination)
+        else:
+            X = _amount_matrix(df)
+            self.model.fit(X)
+            self._split_thresholds = None
+            self._interval_is_anomaly = None
         self.is_fitted = True
+        return self
+
+    def _build_interval_lookup(self):
+        # On a single feature the forest's prediction is constant between
+        # consecutive split thresholds, so predicting one representative amount
+        # per interval gives an exact lookup table for is_anomaly.
+        thresholds = np.unique(np.concatenate([
+            est.tree_.threshold[est.tree_.feature >= 0] for est in self.model.estimators_
+        ]))
+        if thresholds.size == 0:
+            reps = np.zeros(1, dtype=self._dtype)
+        else:
+            # Trees compare float32 inputs against float64 thresholds; use the
+            # largest float32 <= each threshold, plus one above the last
+            reps = thresholds.astype(self._dtype)
+            reps = np.where(reps > thresholds, np.nextafter(reps, self._dtype(-np.inf)), reps)
+            top = self._dtype(thresholds[-1])
+            if top <= thresholds[-1]:
+                top = np.nextafter(top, self._dtype(np.inf))
+            reps = np.append(reps, top).astype(self._dtype)
+        self._split_thresholds = thresholds
+        self._interval_is_anomaly = self.model.predict(reps.reshape(-1, 1)) == -1
+
+    def _score_arrays(self, data):
+        # (anomaly_score, is_anomaly) arrays; lower scores are more anomalous
+        if self.method == "mad":
+            return score_z(_amounts(data), self._med, 1.0 / self._mad, self._cut)
+        X = _amount_matrix(data)
+        if len(X) > _IFOREST_CHUNK_ROWS:
+            # Tree traversal releases the GIL: score row chunks on threads
+            chunks = np.array_split(X, -(-len(X) // _IFOREST_CHUNK_ROWS))
+            scores = np.concatenate(Parallel(n_jobs=-1, prefer="threads")(
+                delayed(self.model.decision_function)(chunk) for chunk in chunks
+            ))
+        else:
+            scores = self.model.decision_function(X)
+        # IsolationForest.predict is decision_function < 0; reuse the scores
+        return scores, scores < 0
 
-    def score(self, df):
+    def score(self, df, inplace=True):
+        # Adds anomaly_score/is_anomaly to df itself unless inplace=False
         if not self.is_fitted:
             raise RuntimeError("Model not fitted. Call fit() first.")
-        df = df.copy()
-        df["anomaly_score"] = self.model.decision_function(df[["amount"]])
-        df["is_anomaly"] = self.model.predict(df[["amount"]]) == -1
+        if not inplace:
+            df = df.copy()
+        df["anomaly_score"], df["is_anomaly"] = self._score_arrays(df)
         return df
 
+    # Array interface, following IsolationForest: -1 for anomalies, 1 otherwise
+    def predict(self, data):
+        if not self.is_fitted:
+            raise NotFittedError("Model not fitted. Call fit() first.")
+        return np.where(self._score_arrays(data)[1], -1, 1)
+
+    def get_anomaly_scores(self, data):
+        if not self.is_fitted:
+            raise NotFittedError("Model not fitted. Call fit() first.")
+        return self._score_arrays(data)[0]
+
+    def fit_predict(self, data):
+        return self.fit(data).predict(data)
+
     def is_anomaly(self, transaction):
         # transaction: dict with 'amount' key
         if not self.is_fitted:
             raise RuntimeError("Model not fitted. Call fit() first.")
-        import numpy as np
-        amount = transaction["amount"]
-        pred = self.model.predict(np.array([[amount]]))
-        return pred[0] == -1
\ No newline at end of file
+        if self.method == "mad":
+            return bool(abs(self._dtype(transaction["amount"]) - self._med) / self._mad > self._cut)
+        if self._interval_is_anomaly is None:
+            self._build_interval_lookup()
+        idx = np.searchsorted(self._split_thresholds, self._dtype(transaction["amount"]))
+        return bool(self._interval_is_anomaly[idx])
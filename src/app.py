@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
+import hashlib
 import os
-import requests
 from data_prep import load_and_prepare
 
 # App title and subtitle (always visible)
@@ -12,15 +12,22 @@ st.caption("Understand your spending, spot anomalies, and improve your financial
 st.sidebar.header("📥 Data Source")
 data_source = st.sidebar.radio("Choose data source:", ["Upload CSV", "Connect Bank (Plaid)"], key="data_source_radio")
 
-# Initialize session state for data persistence across reruns
-if "df" not in st.session_state:
-    st.session_state.df = None
+# Initialize session state for data persistence across reruns (once per session)
+def _init_state():
+    if st.session_state.get("_inited"):
+        return
+    st.session_state.setdefault("df", None)
+    st.session_state.setdefault("selected_tab", 3)  # Default to "Ask AI" tab
+    st.session_state.setdefault("plaid_access_token", None)
+    st.session_state["_inited"] = True
+
+_init_state()
 
 # Show file uploader if Upload CSV is selected
 if data_source == "Upload CSV":
     uploaded = st.file_uploader("Upload your bank statement (CSV)", type=["csv"])
     if uploaded:
-        st.session_state.df = pd.read_csv(uploaded)
+        st.session_state.df = pd.read_csv(uploaded, engine="pyarrow", dtype_backend="pyarrow")
     elif st.session_state.df is None:
         st.info("Upload a CSV to begin.")
         st.stop()
@@ -64,22 +71,23 @@ from insights_engine import (
     get_anomalies,
     get_health_score,
     generate_insights,
+    compute_all_metrics,
 )
 from nlp_router import route_query
-from banking_api import PlaidBankingAPI
+from banking_api import PlaidBankingAPI, json_dumps, json_loads, make_retry_session
 
 st.set_page_config(page_title="Financial Insights AI", layout="wide")
 
-# Initialize session state for data persistence across reruns
-if "df" not in st.session_state:
-    st.session_state.df = None
-if "selected_tab" not in st.session_state:
-    st.session_state.selected_tab = 3  # Default to "Ask AI" tab
-
 # Helper: If Analyse button was clicked, set selected_tab to 3 before rendering tabs
 if "analyse_clicked" in st.session_state and st.session_state["analyse_clicked"]:
     st.session_state.selected_tab = 3
 
+# Shared HTTP session for Plaid calls: keeps the TLS connection alive across
+# reruns and retries connection failures
+@st.cache_resource
+def _plaid_session():
+    return make_retry_session()
+
 # Helper function to create Plaid Link token (for sandbox testing)
 def create_plaid_link_token(client_id, secret, environment="sandbox"):
     """Create a Plaid Link token for the UI flow"""
@@ -94,9 +102,14 @@ def create_plaid_link_token(client_id, secret, environment="sandbox"):
             "country_codes": ["US"],
             "products": ["transactions"]
         }
-        response = requests.post(url, json=payload)
+        response = _plaid_session().post(
+            url,
+            data=json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=(3.05, 10),
+        )
         response.raise_for_status()
-        return response.json().get("link_token")
+        return json_loads(response.content).get("link_token")
     except Exception as e:
         st.error(f"Could not create Plaid Link token: {e}")
         return None
@@ -126,10 +139,6 @@ if data_source == "Connect Bank (Plaid)":
         st.error(f"❌ Plaid error: {e}")
         st.stop()
     
-    # Initialize session state
-    if "plaid_access_token" not in st.session_state:
-        st.session_state.plaid_access_token = None
-    
     st.subheader("🔐 Connect Your Bank Account")
     
     st.warning("⚠️ **Sandbox Mode**: Using test data only. Upgrade to production for real bank connections.")
@@ -178,13 +187,48 @@ if data_source == "Connect Bank (Plaid)":
 if st.session_state.df is None:
     st.stop()
 
-df = load_and_prepare(st.session_state.df)
-
-model = train_anomaly_model(df)
-df = score_transactions(model, df)
-
-total_spend, total_income, num_tx = get_summary_metrics(df)
-health_score, health_text = get_health_score(df)
+# Cache preparation, training and scoring so widget interactions and tab
+# switches reuse them instead of recomputing on every Streamlit rerun
+def _frame_key(df):
+    # Order-sensitive digest of every column, the index and the column names,
+    # so different data never shares a cache entry
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    digest.update(repr(list(df.columns)).encode())
+    return digest.hexdigest()
+
+@st.cache_data(show_spinner=False)
+def _prepare(raw_key, _raw_df):
+    return load_and_prepare(_raw_df)
+
+@st.cache_resource(show_spinner=False)
+def _train(df_key, _df):
+    return train_anomaly_model(_df)
+
+@st.cache_data(show_spinner=False)
+def _score(df_key, _df):
+    return score_transactions(_train(df_key, _df), _df)
+
+# Lowercased description/merchant/name text per row, built once per dataset
+# so merchant searches are a single plain substring scan. Keyed on the same
+# full-frame key as the scored frame it is built from, so its index always
+# lines up with the frame being filtered
+@st.cache_data(show_spinner=False)
+def _search_blob(df_key, _df):
+    cols = [c for c in ["description", "merchant", "name"] if c in _df.columns]
+    if not cols:
+        return pd.Series("", index=_df.index)
+    # Whole-column concatenation instead of a Python join per row
+    text = [_df[c].astype(str) for c in cols]
+    return text[0].str.cat(text[1:], sep="\t", na_rep="").str.lower()
+
+df = _prepare(_frame_key(st.session_state.df), st.session_state.df)
+df_key = _frame_key(df)
+df = _score(df_key, df)
+
+metrics = compute_all_metrics(df)
+total_spend, total_income, num_tx = get_summary_metrics(df, metrics)
+health_score, health_text = get_health_score(df, metrics)
 
 st.write(health_text)
 st.markdown("---")
@@ -195,9 +239,6 @@ col2.metric("Total Income", f"£{total_income:,.2f}")
 col3.metric("Transactions", num_tx)
 col4.metric("Health Score", f"{health_score}/100")
 
-st.write(health_text)
-st.markdown("---")
-
 
 # Budget Recommendation Engine integration
 from budget_engine import BudgetRecommendationEngine
@@ -283,14 +324,10 @@ with tab4:
                         merchant = params.get("merchant")
                         amount_min = params.get("amount_min")
                         amount_max = params.get("amount_max")
-                        import re
-                        result = df.copy()
+                        result = df
                         if merchant:
-                            mask = False
-                            for col in ["description", "merchant", "name"]:
-                                if col in df.columns:
-                                    mask = mask | df[col].astype(str).str.contains(re.escape(merchant), case=False, na=False)
-                            result = result[mask]
+                            blob = _search_blob(df_key, df)
+                            result = result[blob.str.contains(merchant.lower(), regex=False, na=False)]
                         if amount_min is not None or amount_max is not None:
                             if amount_min is not None:
                                 result = result[abs(result["amount"]) >= amount_min]
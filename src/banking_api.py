@@ -14,20 +14,144 @@ Setup:
 
 """
 import os
-from typing import Dict, List, Optional
+import json
+import asyncio
+import importlib.util
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timedelta
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Checked without importing: the Plaid SDK is slow to import, so it is only
+# imported once a PlaidBankingAPI is created
+PLAID_AVAILABLE = importlib.util.find_spec("plaid") is not None
+
+# Set by _import_plaid() on first use
+Configuration = None
+ApiClient = None
+ApiException = None
+plaid_api = None
+TransactionsSyncRequest = None
+
+
+def _import_plaid():
+    """Import the Plaid SDK on first call and memoize it in module globals."""
+    global Configuration, ApiClient, ApiException, plaid_api, TransactionsSyncRequest
+    if plaid_api is None:
+        from plaid import Configuration as _Configuration, ApiClient as _ApiClient, ApiException as _ApiException
+        from plaid.api import plaid_api as _plaid_api
+        from plaid.model.transactions_sync_request import TransactionsSyncRequest as _TransactionsSyncRequest
+        Configuration, ApiClient, ApiException = _Configuration, _ApiClient, _ApiException
+        TransactionsSyncRequest = _TransactionsSyncRequest
+        plaid_api = _plaid_api
+
+# orjson parses/serializes in native code; fall back to the stdlib if missing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
-# Check for required packages at module load time
+# aiohttp enables concurrent multi-account fetches; optional
 try:
-    from plaid import Configuration, ApiClient
-    from plaid.api import plaid_api
-    from plaid.model.transactions_get_request import TransactionsGetRequest
-    from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
-    PLAID_AVAILABLE = True
-except ImportError as e:
-    PLAID_AVAILABLE = False
-    PLAID_ERROR = str(e)
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# (connect, read) timeout for Open Banking requests
+OPEN_BANKING_TIMEOUT = (5, 30)
+
+# Plaid items whose synced transactions are kept for incremental re-syncs
+SYNC_CACHE_ITEMS = 8
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize a request payload to JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def json_loads(data):
+    """Parse a JSON response body (bytes or str)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def make_retry_session(pool_connections: int = 1, pool_maxsize: int = 1, allowed_methods=None):
+    """
+    Create a keep-alive requests session that retries transient errors.
+
+    Status-code retries (429/5xx) apply only to allowed_methods, which default
+    to urllib3's idempotent methods; POST is left out so that non-idempotent
+    calls such as the Plaid public-token exchange are never replayed.
+    Connection failures before a request is sent are retried for any method.
+
+    :param pool_connections: Number of host pools to cache
+    :param pool_maxsize: Connections kept alive per host
+    :param allowed_methods: HTTP methods retried on error responses
+    :return: requests.Session
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS if allowed_methods is None else allowed_methods,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Fixed schema for Plaid transactions ("name" is exposed as description)
+TRANSACTION_SCHEMA = pa.schema([
+    ("transaction_id", pa.string()),
+    ("account_id", pa.string()),
+    ("date", pa.date32()),
+    ("amount", pa.float64()),
+    ("description", pa.string()),
+    ("merchant", pa.string()),
+])
+
+
+def _to_arrow_batch(transactions) -> pa.RecordBatch:
+    """Convert one page of Plaid transaction objects into an Arrow batch."""
+    return pa.RecordBatch.from_pydict({
+        "transaction_id": [tx.transaction_id for tx in transactions],
+        "account_id": [tx.account_id for tx in transactions],
+        "date": [tx.date for tx in transactions],
+        "amount": [tx.amount for tx in transactions],
+        "description": [tx.name for tx in transactions],
+        "merchant": [getattr(tx, "merchant_name", None) for tx in transactions],
+    }, schema=TRANSACTION_SCHEMA)
+
+
+def _drop_ids(data, transaction_ids):
+    """Rows of an Arrow batch or table whose transaction_id is not in transaction_ids."""
+    ids = pa.array(transaction_ids, pa.string())
+    return data.filter(pc.invert(pc.is_in(data["transaction_id"], value_set=ids)))
+
+
+def _batch_to_frame(data) -> pd.DataFrame:
+    """Convert an Arrow batch or table to a DataFrame with datetime dates."""
+    df = data.to_pandas()
+    df["date"] = pd.to_datetime(df["date"])
+    return df
 
 
 class PlaidBankingAPI:
@@ -36,6 +160,19 @@ class PlaidBankingAPI:
     Plaid supports 12,000+ financial institutions globally.
     """
 
+    # PlaidApi clients shared across instances so their urllib3 connection
+    # pool (keep-alive, TLS sessions) is reused; keyed by environment and
+    # credentials
+    _CLIENT_CACHE: Dict[tuple, object] = {}
+
+    # /transactions/sync state for the most recently synced items, keyed by
+    # environment, client and access token: (next cursor, Arrow table of the
+    # item's transactions). Later syncs of a cached item fetch only the
+    # changes since its cursor; the least recently used item is evicted
+    # beyond SYNC_CACHE_ITEMS.
+    _SYNC_STATE: "OrderedDict[tuple, tuple]" = OrderedDict()
+    _SYNC_STATE_LOCK = threading.Lock()
+
     def __init__(
         self,
         client_id: Optional[str] = None,
@@ -53,6 +190,7 @@ class PlaidBankingAPI:
             raise ImportError(
                 "Plaid SDK not installed. Run: pip install plaid-python"
             )
+        _import_plaid()
 
         self.client_id = client_id or os.getenv("PLAID_CLIENT_ID")
         self.secret = secret or os.getenv("PLAID_SECRET")
@@ -63,6 +201,11 @@ class PlaidBankingAPI:
                 "Plaid credentials not found. Set PLAID_CLIENT_ID and PLAID_SECRET env vars."
             )
 
+        key = (self.environment, self.client_id, self.secret)
+        if key in self._CLIENT_CACHE:
+            self.client = self._CLIENT_CACHE[key]
+            return
+
         # Map environment to Plaid host
         env_map = {
             "sandbox": "https://sandbox.plaid.com",
@@ -77,9 +220,133 @@ class PlaidBankingAPI:
                 "secret": self.secret,
             },
         )
+        # Enough pooled connections for concurrent callers sharing the client
+        configuration.connection_pool_maxsize = 20
         
         api_client = ApiClient(configuration)
         self.client = plaid_api.PlaidApi(api_client)
+        self._CLIENT_CACHE[key] = self.client
+
+    @staticmethod
+    def _validate_access_token(access_token: str) -> None:
+        """Raise ValueError if the access token is missing or malformed."""
+        if not access_token or not isinstance(access_token, str):
+            raise ValueError(f"Invalid access token: {access_token}")
+
+        if not access_token.startswith("access-"):
+            raise ValueError(f"Access token has invalid format. Expected 'access-<env>-<id>', got: {access_token[:30]}...")
+
+    @staticmethod
+    def _is_mutation_during_pagination(error) -> bool:
+        """True if Plaid reported that the item changed while we were paging."""
+        try:
+            return json_loads(error.body).get("error_code") == "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"
+        except (TypeError, ValueError):
+            return False
+
+    def _sync_state_get(self, key: tuple):
+        """Return the stored (cursor, table) for an item, marking it recently used."""
+        with self._SYNC_STATE_LOCK:
+            state = self._SYNC_STATE.get(key)
+            if state is None:
+                return None, TRANSACTION_SCHEMA.empty_table()
+            self._SYNC_STATE.move_to_end(key)
+            return state
+
+    def _sync_state_put(self, key: tuple, cursor: str, table: pa.Table) -> None:
+        """Store an item's sync state, evicting the least recently used item."""
+        with self._SYNC_STATE_LOCK:
+            self._SYNC_STATE[key] = (cursor, table)
+            self._SYNC_STATE.move_to_end(key)
+            while len(self._SYNC_STATE) > SYNC_CACHE_ITEMS:
+                self._SYNC_STATE.popitem(last=False)
+
+    def _iter_batches(self, access_token: str, days_back: int, count: int):
+        """
+        Sync an item through /transactions/sync and yield its transactions
+        from the last days_back days as Arrow batches.
+
+        Each page's added and modified transactions are yielded as soon as
+        the page arrives. Rows stored by an earlier sync of the item follow,
+        minus any the new pages modified or removed. The item's state is
+        only updated once the caller has consumed every page.
+
+        If Plaid reports a mutation mid-pagination, paging restarts from the
+        starting cursor as Plaid requires; rows already yielded are not
+        yielded again.
+
+        :param access_token: Access token obtained after Plaid Link authentication
+        :param days_back: Number of days of history to keep
+        :param count: Transactions requested per page (Plaid allows up to 500)
+        """
+        key = (self.environment, self.client_id, access_token)
+        cursor, stored = self._sync_state_get(key)
+
+        # /transactions/sync has no date range, so trim to the window here
+        start = pa.scalar(datetime.now().date() - timedelta(days=days_back), pa.date32())
+
+        upserts, removed, seen = [], [], set()
+        while True:
+            page_cursor, has_more = cursor, True
+            try:
+                while has_more:
+                    kwargs = {"access_token": access_token, "count": count}
+                    if page_cursor:
+                        kwargs["cursor"] = page_cursor
+                    response = self.client.transactions_sync(TransactionsSyncRequest(**kwargs))
+
+                    page = _to_arrow_batch(list(response.added) + list(response.modified))
+                    if seen:
+                        page = _drop_ids(page, list(seen))
+                    seen.update(page["transaction_id"].to_pylist())
+                    upserts.append(page)
+                    removed.extend(tx.transaction_id for tx in response.removed)
+
+                    recent = page.filter(pc.greater_equal(page["date"], start))
+                    if recent.num_rows:
+                        yield recent
+
+                    page_cursor = response.next_cursor
+                    has_more = response.has_more
+            except ApiException as e:
+                if self._is_mutation_during_pagination(e):
+                    continue
+                raise
+            break
+
+        # Stored rows the new pages did not touch
+        kept = _drop_ids(stored, list(seen) + removed)
+        for batch in kept.filter(pc.greater_equal(kept["date"], start)).to_batches(max_chunksize=count):
+            if batch.num_rows:
+                yield batch
+
+        table = pa.concat_tables([kept, pa.Table.from_batches(upserts, schema=TRANSACTION_SCHEMA)])
+        if removed:
+            table = _drop_ids(table, removed)
+        self._sync_state_put(key, page_cursor, table.combine_chunks())
+
+    def iter_transactions(
+        self, access_token: str, days_back: int = 30, chunksize: int = 500
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream transactions in DataFrame chunks as Plaid pages arrive.
+
+        :param access_token: Access token obtained after Plaid Link authentication
+        :param days_back: Number of days of history to fetch (default: 30)
+        :param chunksize: Approximate rows per yielded DataFrame; pages of up
+            to 500 are combined until a chunk reaches this size (default: 500)
+        :return: Iterator of DataFrames
+        """
+        self._validate_access_token(access_token)
+        pending, pending_rows = [], 0
+        for batch in self._iter_batches(access_token, days_back, count=min(chunksize, 500)):
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= chunksize:
+                yield _batch_to_frame(pa.Table.from_batches(pending, schema=TRANSACTION_SCHEMA))
+                pending, pending_rows = [], 0
+        if pending:
+            yield _batch_to_frame(pa.Table.from_batches(pending, schema=TRANSACTION_SCHEMA))
 
     def get_transactions(
         self, access_token: str, days_back: int = 90
@@ -92,68 +359,16 @@ class PlaidBankingAPI:
         :return: DataFrame with transaction data
         """
         try:
-            # Validate access token format
-            if not access_token or not isinstance(access_token, str):
-                raise ValueError(f"Invalid access token: {access_token}")
-            
-            if not access_token.startswith("access-"):
-                raise ValueError(f"Access token has invalid format. Expected 'access-<env>-<id>', got: {access_token[:30]}...")
-            
+            self._validate_access_token(access_token)
+
             print(f"🔍 Using access token: {access_token[:30]}... (length: {len(access_token)})")
-            
-            # Calculate date range
-            end_date = datetime.now().date()
-            start_date = end_date - timedelta(days=days_back)
-            
-            # Create transactions request
-            request = TransactionsGetRequest(
-                access_token=access_token,
-                start_date=start_date,
-                end_date=end_date,
-            )
-            
-            # Fetch transactions
-            response = self.client.transactions_get(request)
-            
-            # Extract transactions list from response
-            if hasattr(response, 'transactions'):
-                # Handle API response object format
-                transactions = [tx.to_dict() if hasattr(tx, 'to_dict') else dict(tx) 
-                               for tx in response.transactions]
-            elif isinstance(response, dict) and 'transactions' in response:
-                # Handle dict response format
-                transactions = response.get('transactions', [])
-            else:
-                # Fallback
-                transactions = []
-            
-            # Convert to DataFrame
-            if not transactions:
-                return pd.DataFrame(
-                    columns=["date", "amount", "description"]
-                )
-                
-            df = pd.DataFrame(transactions)
-            
-            if df.empty:
-                return df
-            
-            # Normalize columns
-            df = df.rename(columns={
-                "name": "description",
-                "merchant_name": "merchant",
-            })
-            
-            # Ensure date is datetime
-            if "date" in df.columns:
-                df["date"] = pd.to_datetime(df["date"])
-            
-            # Convert amount to float
-            if "amount" in df.columns:
-                df["amount"] = df["amount"].astype(float)
-            
-            return df
-            
+
+            # Large chunks: few frames to concatenate, each built while paging
+            chunks = list(self.iter_transactions(access_token, days_back=days_back, chunksize=10_000))
+            if not chunks:
+                return _batch_to_frame(TRANSACTION_SCHEMA.empty_table())
+            return pd.concat(chunks, ignore_index=True)
+
         except Exception as e:
             error_msg = f"Failed to fetch transactions from Plaid: {str(e)}"
             print(f"❌ {error_msg}")
@@ -192,11 +407,10 @@ class OpenBankingAPI:
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token: Optional[str] = None
+        self._session = make_retry_session(pool_connections=10, pool_maxsize=20)
 
     def authenticate(self) -> None:
         """Obtain OAuth2 access token."""
-        import requests
-
         token_url = f"{self.base_url}/oauth/token"
         data = {
             "grant_type": "client_credentials",
@@ -204,9 +418,10 @@ class OpenBankingAPI:
             "client_secret": self.client_secret,
         }
 
-        response = requests.post(token_url, data=data)
+        response = self._session.post(token_url, data=data, timeout=OPEN_BANKING_TIMEOUT)
         response.raise_for_status()
         self.access_token = response.json()["access_token"]
+        self._session.headers["Authorization"] = f"Bearer {self.access_token}"
 
     def get_transactions(self, account_id: str) -> pd.DataFrame:
         """
@@ -215,20 +430,62 @@ class OpenBankingAPI:
         :param account_id: Account ID from the bank
         :return: DataFrame with transactions
         """
-        import requests
-
         if not self.access_token:
             self.authenticate()
 
         url = f"{self.base_url}/accounts/{account_id}/transactions"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-
-        response = requests.get(url, headers=headers)
+        response = self._session.get(url, timeout=OPEN_BANKING_TIMEOUT)
         response.raise_for_status()
 
         data = response.json()
         return pd.DataFrame(data)
 
+    @staticmethod
+    def _make_aio_session():
+        """Create an aiohttp session with a pooled connector for one batch of fetches."""
+        connector = aiohttp.TCPConnector(limit=20, limit_per_host=10, ttl_dns_cache=300)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=OPEN_BANKING_TIMEOUT[0], sock_read=OPEN_BANKING_TIMEOUT[1]
+            ),
+        )
+
+    async def get_transactions_many(
+        self, account_ids: List[str], max_concurrency: int = 10
+    ) -> pd.DataFrame:
+        """
+        Fetch transactions for several accounts concurrently.
+
+        :param account_ids: Account IDs from the bank
+        :param max_concurrency: Maximum number of requests in flight
+        :return: DataFrame with the transactions of all accounts
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp not installed. Run: pip install aiohttp")
+
+        if not self.access_token:
+            # authenticate() uses the blocking requests session; keep it off the event loop
+            await asyncio.to_thread(self.authenticate)
+
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(session, account_id: str) -> pd.DataFrame:
+            url = f"{self.base_url}/accounts/{account_id}/transactions"
+            async with sem:
+                async with session.get(url, headers=headers) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+            return pd.DataFrame(data)
+
+        # The session belongs to this call's event loop and is always closed on exit
+        async with self._make_aio_session() as session:
+            frames = await asyncio.gather(*(fetch(session, account_id) for account_id in account_ids))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
 
 class BankingAPIAdapter:
     """
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 class BudgetRecommendationEngine:
@@ -12,15 +13,31 @@ class BudgetRecommendationEngine:
         months: number of past months to analyze
         Returns: dict {category: recommended_budget}
         """
-        df = df.copy()
-        df['date'] = pd.to_datetime(df['date'])
-        cutoff = df['date'].max() - pd.DateOffset(months=months)
-        df_recent = df[df['date'] >= cutoff]
-        if categories is None:
-            categories = df_recent['category'].unique()
-        recommendations = {}
-        for cat in categories:
-            cat_spend = df_recent[df_recent['category'] == cat]['amount']
-            monthly_avg = abs(cat_spend.sum()) / months if months > 0 else 0
-            recommendations[cat] = round(monthly_avg, 2)
-        return recommendations
+        dates = pd.to_datetime(df['date'])
+        cutoff = dates.max() - pd.DateOffset(months=months)
+        df_recent = self._rows_since(df, dates, cutoff)[['category', 'amount']]
+        # Money is summed in float64 whatever the stored amount dtype
+        amounts = pd.Series(df_recent['amount'].to_numpy(dtype=np.float64), index=df_recent.index)
+        # One grouped sum instead of re-filtering the frame per category
+        totals = amounts.groupby(df_recent['category'], observed=True, sort=False).sum().abs()
+        monthly_avg = totals / months if months > 0 else totals * 0
+        if categories is not None:
+            monthly_avg = monthly_avg.reindex(categories, fill_value=0.0)
+        return monthly_avg.round(2).to_dict()
+
+    @staticmethod
+    def _rows_since(df, dates, cutoff):
+        """Rows of df dated on/after cutoff, found by binary search on the dates."""
+        if dates.dt.tz is not None:
+            # Compare in UTC as naive datetime64 so the search runs on numpy values
+            dates = dates.dt.tz_convert("UTC").dt.tz_localize(None)
+            cutoff = cutoff.tz_convert("UTC").tz_localize(None)
+        values = dates.to_numpy()
+        if dates.is_monotonic_increasing:
+            # Already in date order (and free of NaT): slice without a mask
+            return df.iloc[np.searchsorted(values, cutoff.to_datetime64()):]
+        # NaT sorts last; keep the selected rows in their original order
+        order = np.argsort(values, kind='stable')
+        n_valid = len(values) - int(dates.isna().sum())
+        start = np.searchsorted(values[order[:n_valid]], cutoff.to_datetime64())
+        return df.iloc[np.sort(order[start:n_valid])]
@@ -5,8 +5,12 @@ Categorizes financial transactions using both keyword matching
 and advanced transformer-based semantic analysis.
 """
 
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
+import pandas as pd
+
 # Try to import advanced NLP (graceful fallback if not available)
 try:
     from advanced_nlp import TransformerNLPEngine
@@ -15,6 +19,13 @@ try:
 except ImportError:
     ADVANCED_NLP_AVAILABLE = False
 
+# Aho-Corasick keyword matching (graceful fallback to a Python scan)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Keyword-based category map (fallback)
 CATEGORY_MAP = {
     "TESCO": "Groceries",
@@ -74,6 +85,16 @@ CATEGORY_MAP = {
     "GAS": "Utilities",
 }
 
+# One automaton over all CATEGORY_MAP keywords, so each description is scanned
+# once in C. Values carry the keyword's position in CATEGORY_MAP so that, as
+# before, the first listed keyword wins when several match.
+_AUTOMATON = None
+if AHOCORASICK_AVAILABLE:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _priority, (_key, _category) in enumerate(CATEGORY_MAP.items()):
+        _AUTOMATON.add_word(_key, (_priority, _category))
+    _AUTOMATON.make_automaton()
+
 # Initialize advanced NLP engine (lazy loaded)
 _nlp_engine = None
 
@@ -88,6 +109,25 @@ def get_nlp_engine() -> Optional[TransformerNLPEngine]:
             return None
     return _nlp_engine
 
+def _keyword_category(description: str) -> Optional[str]:
+    """Return the keyword-map category for a description, or None if no keyword matches."""
+    # Missing values (None/NaN) match nothing, as in categorise_series
+    if not isinstance(description, str) or not description:
+        return None
+    return _categorise_impl(description.upper())
+
+@lru_cache(maxsize=8192)
+def _categorise_impl(desc_upper: str) -> Optional[str]:
+    """Keyword lookup on an uppercased description, memoized for repeat merchants."""
+    if _AUTOMATON is not None:
+        hits = [value for _, value in _AUTOMATON.iter(desc_upper)]
+        return min(hits)[1] if hits else None
+    
+    for key, category in CATEGORY_MAP.items():
+        if key in desc_upper:
+            return category
+    return None
+
 def categorise(description: str) -> str:
     """
     Categorize a transaction description.
@@ -97,15 +137,13 @@ def categorise(description: str) -> str:
     :param description: Transaction description
     :return: Category string
     """
-    if not description:
+    if not isinstance(description, str) or not description:
         return "Other"
     
-    desc_upper = description.upper()
-    
     # First try keyword matching (fast and reliable)
-    for key, category in CATEGORY_MAP.items():
-        if key in desc_upper:
-            return category
+    category = _keyword_category(description)
+    if category:
+        return category
     
     # Try advanced semantic categorization
     nlp_engine = get_nlp_engine()
@@ -118,6 +156,48 @@ def categorise(description: str) -> str:
     # Default fallback
     return "Other"
 
+def _semantic_fallback(descriptions: list, categories: list, nlp_engine) -> list:
+    """
+    Fill in descriptions the keyword map missed with one batched call to the
+    semantic engine (if enabled); anything still unmatched becomes "Other".
+    
+    :param descriptions: Transaction descriptions
+    :param categories: Keyword categories aligned with descriptions (None if unmatched)
+    :param nlp_engine: Semantic engine, or None to skip the fallback
+    :return: List of categories
+    """
+    if nlp_engine:
+        unmatched = [i for i, cat in enumerate(categories) if cat is None and descriptions[i]]
+        if unmatched:
+            try:
+                semantic = nlp_engine.categorize_batch([descriptions[i] for i in unmatched])
+                for i, cat in zip(unmatched, semantic):
+                    categories[i] = cat
+            except Exception as e:
+                print(f"⚠️ Semantic categorization failed, using default: {e}")
+    
+    return [cat or "Other" for cat in categories]
+
+def categorise_series(s: pd.Series) -> pd.Series:
+    """
+    Categorize a Series of transaction descriptions.
+    
+    Each distinct description is categorized once, with the same precedence
+    as categorise() (the keyword listed first in CATEGORY_MAP wins); those the
+    keyword map misses go to the semantic engine in a single batched call.
+    
+    :param s: Series of transaction descriptions
+    :return: Series of categories with the same index
+    """
+    codes, uniques = pd.factorize(s)
+    descriptions = [d if isinstance(d, str) else "" for d in uniques]
+    categories = [_keyword_category(desc) for desc in descriptions]
+    categories = _semantic_fallback(descriptions, categories, get_nlp_engine())
+    
+    # Missing descriptions are coded -1 and pick up the trailing "Other"
+    lookup = np.array(categories + ["Other"], dtype=object)
+    return pd.Series(lookup[codes], index=s.index)
+
 class TransactionCategorizer:
     """
     Enhanced transaction categorizer using both keyword and semantic methods.
@@ -146,7 +226,11 @@ class TransactionCategorizer:
         """
         Categorize multiple transactions efficiently.
         
+        Keyword matches are resolved first; the remaining descriptions go
+        to the semantic engine in a single batched call.
+        
         :param descriptions: List of transaction descriptions
         :return: List of categories
         """
-        return [self.categorize(desc) for desc in descriptions]
+        categories = [_keyword_category(desc) for desc in descriptions]
+        return _semantic_fallback(descriptions, categories, self.nlp_engine)
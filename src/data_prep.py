@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
-from categorisation import categorise
+from categorisation import categorise_series
 
 def load_and_prepare(df):
-    df = df.copy()
+    # Shallow copy: the columns below are replaced, never written in place,
+    # so the caller's frame is untouched without copying every column
+    df = df.copy(deep=False)
 
     # Standardise column names
     df.columns = [c.lower().strip() for c in df.columns]
@@ -10,14 +13,60 @@ def load_and_prepare(df):
     # Parse dates
     if "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        df["month"] = df["date"].dt.month
-        df["year"] = df["date"].dt.year
+        # Monthly period computed once; period_m is reused by get_trend_data
+        per = df["date"].dt.to_period("M")
+        df["period_m"] = per.astype(str).astype("category")
+        df["month"] = per.dt.month
+        df["year"] = per.dt.year
 
-    # Clean description
+    # Clean description (Arrow strings: uppercased in a C kernel)
     if "description" in df.columns:
-        df["description"] = df["description"].astype(str).str.upper()
+        df["description"] = df["description"].astype("string[pyarrow]").str.upper()
 
-    # Categorise
-    df["category"] = df["description"].apply(categorise)
+    # Categorise (dictionary-encoded: groupbys compare integer codes)
+    df["category"] = categorise_series(df["description"]).astype("category")
 
-    return df
\ No newline at end of file
+    # Money stays float64: float32 cannot hold every penny above ~£167k
+    # (NumPy-backed, so Arrow-read uploads get NaN rather than <NA>)
+    if "amount" in df.columns:
+        df["amount"] = pd.to_numeric(df["amount"]).astype(np.float64)
+
+    return df
+
+
+# Columns identifying a transaction when clean_data is given no dedup_subset
+DEFAULT_DEDUP_SUBSET = ("date", "amount", "description")
+
+
+def clean_data(df, dedup_subset=None, date_format=None):
+    # Drop duplicate transactions by hashing only the identifying columns
+    # (one uint64 per row) instead of comparing every column of every row.
+    # By default whichever of DEFAULT_DEDUP_SUBSET the frame has are used
+    # (all columns if none); an explicit subset must exist in full.
+    if not dedup_subset:
+        cols = [c for c in DEFAULT_DEDUP_SUBSET if c in df.columns] or list(df.columns)
+    else:
+        cols = list(dedup_subset)
+        missing = [c for c in cols if c not in df.columns]
+        if missing:
+            raise KeyError(f"dedup_subset columns not in DataFrame: {missing}")
+    row_hash = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    _, keep = np.unique(row_hash, return_index=True)
+    # Own copy: the date column (and prepare_features' columns) are assigned
+    # below. Without duplicates the row selection is skipped.
+    df = df.iloc[np.sort(keep)].copy() if len(keep) < len(df) else df.copy()
+
+    # A known date_format skips per-string format inference
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce", format=date_format, cache=True)
+
+    return df
+
+def prepare_features(df):
+    # Numeric model features derived from date and amount
+    df = clean_data(df)
+    df["month"] = df["date"].dt.month
+    df["day_of_week"] = df["date"].dt.dayofweek
+    df["amount_abs"] = df["amount"].abs()
+    features = ["amount", "amount_abs", "month", "day_of_week"]
+    return df, features
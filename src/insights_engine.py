@@ -1,26 +1,45 @@
-def get_summary_metrics(df):
-    total_spend = df[df["amount"] < 0]["amount"].sum()
-    total_income = df[df["amount"] > 0]["amount"].sum()
-    num_tx = len(df)
-    return total_spend, total_income, num_tx
+import numpy as np
+
+def compute_all_metrics(df):
+    # One pass over the amount and anomaly arrays, shared by the functions below
+    # float64 whatever the stored amount dtype (Arrow-backed, float32 input, ...)
+    amt = df["amount"].to_numpy(dtype=np.float64)
+    neg = amt < 0
+    pos = amt > 0
+    is_anomaly = df["is_anomaly"].to_numpy() if "is_anomaly" in df.columns else None
+    return {
+        "total_spend": amt[neg].sum(),
+        "total_income": amt[pos].sum(),
+        "num_tx": len(df),
+        "anomalies": int(is_anomaly.sum()) if is_anomaly is not None else 0,
+    }
+
+def get_summary_metrics(df, metrics=None):
+    metrics = metrics or compute_all_metrics(df)
+    return metrics["total_spend"], metrics["total_income"], metrics["num_tx"]
 
 def get_category_breakdown(df):
-    return df.groupby("category")["amount"].sum().reset_index()
+    return df.groupby("category", observed=True, sort=False)["amount"].sum().reset_index()
 
 def get_trend_data(df):
+    # period_m is precomputed (as a categorical) by load_and_prepare;
+    # "YYYY-MM" categories sort chronologically
+    if "period_m" not in df.columns:
+        df = df.assign(period_m=df["date"].dt.to_period("M").astype(str))
     return (
-        df.assign(period=df["date"].dt.to_period("M").astype(str))
-          .groupby("period")["amount"]
+        df.groupby("period_m", observed=True)["amount"]
           .sum()
+          .rename_axis("period")
           .reset_index()
     )
 
 def get_anomalies(df):
     return df[df["is_anomaly"] == True]
 
-def get_health_score(df):
-    anomalies = df["is_anomaly"].sum()
-    savings_ratio = df[df["amount"] > 0]["amount"].sum() / abs(df[df["amount"] < 0]["amount"].sum() + 1)
+def get_health_score(df, metrics=None):
+    metrics = metrics or compute_all_metrics(df)
+    anomalies = metrics["anomalies"]
+    savings_ratio = metrics["total_income"] / abs(metrics["total_spend"] + 1)
 
     score = 100
     score -= anomalies * 2
@@ -36,15 +55,57 @@ def get_health_score(df):
 
     return score, explanation
 
-def generate_insights(df):
+def generate_insights(df, metrics=None):
+    metrics = metrics or compute_all_metrics(df)
     insights = []
 
     groceries = df[df["category"] == "Groceries"]["amount"].sum()
     if groceries:
         insights.append(f"Your grocery spending this period is £{abs(groceries):,.2f}.")
 
-    anomalies = df["is_anomaly"].sum()
+    anomalies = metrics["anomalies"]
     if anomalies > 0:
         insights.append(f"{anomalies} transactions appear unusual.")
 
-    return insights
\ No newline at end of file
+    return insights
+
+# Class-based interface over a prepared transactions frame
+class InsightsEngine:
+    def __init__(self, df):
+        self.df = df
+
+    def get_summary_statistics(self):
+        # Plain ndarray reductions skip pandas' per-call dispatch
+        amt = self.df["amount"].to_numpy(dtype=np.float64, copy=False)
+        total_income = float(amt[amt > 0].sum())
+        total_expenses = float(-amt[amt < 0].sum())
+        return {
+            "total_income": total_income,
+            "total_expenses": total_expenses,
+            "net_flow": total_income - total_expenses,
+            "num_transactions": len(self.df),
+        }
+
+    def get_category_breakdown(self):
+        # observed=True: only categories present in the data (categorical input)
+        totals = self.df.groupby("category", observed=True, sort=False)["amount"].sum()
+        return {str(cat): float(total) for cat, total in totals.items()}
+
+    def get_top_transactions(self, n=5):
+        # Partial selection instead of sorting the whole frame
+        return self.df.nlargest(n, "amount", keep="first")
+
+    def get_insights(self):
+        stats = self.get_summary_statistics()
+        insights = [
+            f"You received £{stats['total_income']:,.2f} and spent "
+            f"£{stats['total_expenses']:,.2f} (net £{stats['net_flow']:,.2f})."
+        ]
+
+        spending = {cat: total for cat, total in self.get_category_breakdown().items() if total < 0}
+        if spending:
+            top = min(spending, key=spending.get)
+            insights.append(f"Your largest spending category is {top} at £{abs(spending[top]):,.2f}.")
+
+        insights.extend(generate_insights(self.df))
+        return insights
@@ -5,10 +5,27 @@ Routes user queries to appropriate analysis handlers using intelligent keyword m
 and query understanding. Handles ANY user query gracefully by searching actual transaction data.
 """
 
+from dataclasses import dataclass
 from typing import Tuple, Dict, List, Optional
 import re
+import weakref
+import numpy as np
 import pandas as pd
 
+# rapidfuzz gives C++ fuzzy matching (graceful fallback to difflib)
+try:
+    from rapidfuzz import process, fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# pyahocorasick matches all routing keywords in one pass (optional)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Define routing patterns with weights
 ROUTING_PATTERNS = {
     "CATEGORY": {
@@ -37,6 +54,104 @@ ROUTING_PATTERNS = {
     },
 }
 
+# Keyword -> routes automaton over ROUTING_PATTERNS, built once at import
+_ROUTE_AUTOMATON = None
+if AHOCORASICK_AVAILABLE:
+    _keyword_routes: Dict[str, List[str]] = {}
+    for _route, _config in ROUTING_PATTERNS.items():
+        for _kw in _config["keywords"]:
+            _keyword_routes.setdefault(_kw, []).append(_route)
+    _ROUTE_AUTOMATON = ahocorasick.Automaton()
+    for _kw, _routes in _keyword_routes.items():
+        _ROUTE_AUTOMATON.add_word(_kw, (_kw, _routes))
+    _ROUTE_AUTOMATON.make_automaton()
+
+def _route_keyword_counts(q_lower: str) -> Dict[str, int]:
+    """Count the distinct ROUTING_PATTERNS keywords found in the query, per route."""
+    counts: Dict[str, int] = {}
+    if _ROUTE_AUTOMATON is not None:
+        # Repeated occurrences of a keyword count once, as with `kw in q_lower`
+        seen = set()
+        for _, (kw, routes) in _ROUTE_AUTOMATON.iter(q_lower):
+            if kw in seen:
+                continue
+            seen.add(kw)
+            for route in routes:
+                counts[route] = counts.get(route, 0) + 1
+        return counts
+
+    for route_type, config in ROUTING_PATTERNS.items():
+        match_count = sum(1 for kw in config["keywords"] if kw in q_lower)
+        if match_count:
+            counts[route_type] = match_count
+    return counts
+
+# Amount-range patterns, compiled once at import
+_AMOUNT_PATTERNS = [
+    (re.compile(r"over\s+£?(\d+(?:\.\d{2})?)"), lambda m: float(m.group(1))),
+    (re.compile(r"more than\s+£?(\d+(?:\.\d{2})?)"), lambda m: float(m.group(1))),
+    (re.compile(r"greater than\s+£?(\d+(?:\.\d{2})?)"), lambda m: float(m.group(1))),
+    (re.compile(r"less than\s+£?(\d+(?:\.\d{2})?)"), lambda m: (0, float(m.group(1)))),
+    (re.compile(r"under\s+£?(\d+(?:\.\d{2})?)"), lambda m: (0, float(m.group(1)))),
+    (re.compile(r"between\s+£?(\d+(?:\.\d{2})?)\s+and\s+£?(\d+(?:\.\d{2})?)"),
+     lambda m: (float(m.group(1)), float(m.group(2)))),
+]
+
+@dataclass
+class _Index:
+    """Lookups derived from one DataFrame, reused across route_query calls."""
+    length: int
+    columns: Tuple
+    categories: List[str]
+    categories_lower: List[str]
+    category_words: List[List[str]]
+    col_unique: Dict[str, np.ndarray]
+    col_unique_lower: Dict[str, List[str]]
+    fuzzy_values: np.ndarray
+    fuzzy_choices: List[str]
+
+# Per-DataFrame indexes keyed by id(df). Entries are removed when their
+# DataFrame is garbage collected and rebuilt if its shape changes.
+_DF_CACHE: Dict[int, _Index] = {}
+
+def _get_index(df: pd.DataFrame) -> _Index:
+    """Return the cached lookup index for df, building it on first use."""
+    key = id(df)
+    columns = tuple(df.columns)
+    index = _DF_CACHE.get(key)
+    if index is not None and index.length == len(df) and index.columns == columns:
+        return index
+
+    categories = []
+    if "category" in df.columns:
+        categories = [str(cat) for cat in df["category"].unique() if isinstance(cat, str)]
+
+    col_unique = {}
+    for col in df.columns:
+        try:
+            col_unique[col] = df[col].dropna().astype(str).unique()
+        except Exception:
+            continue
+    col_unique_lower = {col: [value.lower() for value in values] for col, values in col_unique.items()}
+
+    fuzzy_values = np.unique(np.concatenate(list(col_unique.values()))) if col_unique else np.array([], dtype=object)
+
+    index = _Index(
+        length=len(df),
+        columns=columns,
+        categories=categories,
+        categories_lower=[cat.lower() for cat in categories],
+        category_words=[cat.lower().split() for cat in categories],
+        col_unique=col_unique,
+        col_unique_lower=col_unique_lower,
+        fuzzy_values=fuzzy_values,
+        fuzzy_choices=[value.lower() for value in fuzzy_values],
+    )
+    if key not in _DF_CACHE:
+        weakref.finalize(df, _DF_CACHE.pop, key, None)
+    _DF_CACHE[key] = index
+    return index
+
 def extract_category_from_dataframe(query: str, df: pd.DataFrame) -> Optional[str]:
     """
     Extract category from query by matching against actual dataframe categories.
@@ -51,27 +166,37 @@ def extract_category_from_dataframe(query: str, df: pd.DataFrame) -> Optional[st
     
     import difflib
     q_lower = query.lower()
-    actual_categories = [str(cat) for cat in df["category"].unique() if isinstance(cat, str)]
+    index = _get_index(df)
+    actual_categories = index.categories
 
-    # Try exact match
-    for cat in actual_categories:
-        if cat.lower() in q_lower or cat.lower() == q_lower:
-            return cat
+    # Single pass: prefer the longest category name contained in the query
+    # (so "Other Groceries" beats "Groceries"), else the first category
+    # with one of its words in the query
+    best, best_len, word_match = None, 0, None
+    for cat, cat_lower, cat_words in zip(actual_categories, index.categories_lower, index.category_words):
+        if cat_lower in q_lower:
+            if len(cat_lower) > best_len:
+                best, best_len = cat, len(cat_lower)
+        elif word_match is None and any(word in q_lower for word in cat_words):
+            word_match = cat
+    if best is not None:
+        return best
+    if word_match is not None:
+        return word_match
 
-    # Try partial match (substring)
-    for cat in actual_categories:
-        if cat.lower() in q_lower:
-            return cat
+    words = [w for w in q_lower.split() if len(w) > 2]
 
-    # Try reverse match (category name is part of query)
-    for cat in actual_categories:
-        if cat.lower() in q_lower or any(word in q_lower for word in cat.lower().split()):
-            return cat
+    if RAPIDFUZZ_AVAILABLE:
+        # fuzz.ratio is the same normalized similarity as difflib's ratio
+        for word in words:
+            match = process.extractOne(word, index.categories_lower, scorer=fuzz.ratio, score_cutoff=70)
+            if match:
+                return actual_categories[match[2]]
+        return None
 
     # Try fuzzy match using difflib
-    words = [w for w in q_lower.split() if len(w) > 2]
     for word in words:
-        matches = difflib.get_close_matches(word, [cat.lower() for cat in actual_categories], n=1, cutoff=0.7)
+        matches = difflib.get_close_matches(word, index.categories_lower, n=1, cutoff=0.7)
         if matches:
             # Return the original category with the closest match
             for cat in actual_categories:
@@ -102,39 +227,46 @@ def extract_merchant_from_query(query: str, df: pd.DataFrame) -> Optional[str]:
     if not query_terms:
         return None
 
-    # Search in ALL columns (including category, type, etc.)
-    all_columns = df.columns.tolist()
+    if RAPIDFUZZ_AVAILABLE:
+        # Best fuzzy match (WRatio covers exact, substring and typo matches)
+        # over the unique values of every column
+        index = _get_index(df)
+        for term in query_terms:
+            match = process.extractOne(term, index.fuzzy_choices, scorer=fuzz.WRatio, score_cutoff=70)
+            if match:
+                return str(index.fuzzy_values[match[2]])
+        return None
+
+    # Search in ALL columns (including category, type, etc.). Per-column
+    # stringified uniques come from the cached index; stripped values and
+    # their words are derived once here rather than once per term.
+    index = _get_index(df)
+    col_matchers = []
+    for col, values in index.col_unique.items():
+        lowers = index.col_unique_lower[col]
+        stripped = [value_lower.strip() for value_lower in lowers]
+        col_matchers.append((values, lowers, stripped, [value_lower.split() for value_lower in stripped]))
 
-    import re
     for term in query_terms:
         term_lower = term.lower()
 
         # Try to find exact or partial match in any column
-        for col in all_columns:
-            if col not in df.columns:
-                continue
-            try:
-                col_values = df[col].dropna().astype(str).unique()
-                for value in col_values:
-                    value_lower = str(value).lower().strip()
-                    if (
-                        term_lower == value_lower or                   # exact match
-                        term_lower in value_lower or                   # substring
-                        value_lower in term_lower or                   # reverse
-                        value_lower.startswith(term_lower) or          # startswith
-                        term_lower.startswith(value_lower) or          # reverse
-                        any(term_lower in word or word in term_lower for word in value_lower.split())
-                    ):
-                        return str(value)
-                # Fuzzy match using difflib if no direct match
-                matches = difflib.get_close_matches(term_lower, [str(v).lower() for v in col_values], n=1, cutoff=0.7)
-                if matches:
-                    # Return the original value with the closest match
-                    for value in col_values:
-                        if str(value).lower() == matches[0]:
-                            return str(value)
-            except:
-                continue
+        for values, lowers, stripped, words in col_matchers:
+            for value, value_lower, value_words in zip(values, stripped, words):
+                if (
+                    term_lower == value_lower or                   # exact match
+                    term_lower in value_lower or                   # substring
+                    value_lower in term_lower or                   # reverse
+                    value_lower.startswith(term_lower) or          # startswith
+                    term_lower.startswith(value_lower) or          # reverse
+                    any(term_lower in word or word in term_lower for word in value_words)
+                ):
+                    return str(value)
+            # Fuzzy match using difflib if no direct match
+            matches = difflib.get_close_matches(term_lower, lowers, n=1, cutoff=0.7)
+            if matches:
+                # Return the original value with the closest match
+                return str(values[lowers.index(matches[0])])
 
     return None
 
@@ -148,18 +280,8 @@ def extract_amount_range(query: str) -> Optional[Tuple[float, float]]:
     q_lower = query.lower()
     
     # Match patterns like "over 100", "more than 50", "less than 100"
-    patterns = [
-        (r"over\s+£?(\d+(?:\.\d{2})?)", lambda m: float(m.group(1))),
-        (r"more than\s+£?(\d+(?:\.\d{2})?)", lambda m: float(m.group(1))),
-        (r"greater than\s+£?(\d+(?:\.\d{2})?)", lambda m: float(m.group(1))),
-        (r"less than\s+£?(\d+(?:\.\d{2})?)", lambda m: (0, float(m.group(1)))),
-        (r"under\s+£?(\d+(?:\.\d{2})?)", lambda m: (0, float(m.group(1)))),
-        (r"between\s+£?(\d+(?:\.\d{2})?)\s+and\s+£?(\d+(?:\.\d{2})?)", 
-         lambda m: (float(m.group(1)), float(m.group(2)))),
-    ]
-    
-    for pattern, converter in patterns:
-        match = re.search(pattern, q_lower)
+    for pattern, converter in _AMOUNT_PATTERNS:
+        match = pattern.search(q_lower)
         if match:
             result = converter(match)
             if isinstance(result, tuple):
@@ -208,18 +330,23 @@ def search_transactions(query: str, df: pd.DataFrame) -> Optional[pd.DataFrame]:
     if not search_terms:
         return None
     
-    # Create search mask
-    mask = pd.Series([False] * len(df), index=df.index)
-    
     # Search in multiple columns
     search_columns = ["description", "merchant", "name", "category", "type"]
     
-    import re
-    for term in search_terms:
-        for col in search_columns:
-            if col in df.columns:
-                col_mask = df[col].astype(str).str.contains(re.escape(term), case=False, na=False)
-                mask = mask | col_mask
+    columns = [col for col in search_columns if col in df.columns]
+    if not columns:
+        return None
+    
+    # Terms are matched with numpy char ops against each column's distinct
+    # values only, then broadcast back to rows through the factorized codes
+    terms_lower = [term.lower() for term in search_terms]
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        codes, uniques = pd.factorize(df[col])
+        values_lower = np.char.lower(np.asarray(uniques, dtype=str))
+        hits = np.logical_or.reduce([np.char.find(values_lower, term) >= 0 for term in terms_lower])
+        # Missing values (code -1) never match
+        mask |= np.append(hits, False)[codes]
     
     result = df[mask]
     return result if len(result) > 0 else None
@@ -287,15 +414,13 @@ def route_query(query: str, df: Optional[pd.DataFrame] = None) -> Tuple[str, Dic
     # PRIORITY 2: Check for specific intent keywords
     route_scores = {}
     
+    keyword_counts = _route_keyword_counts(q_lower)
+    
+    # Score in ROUTING_PATTERNS order so ties resolve as before
     for route_type, config in ROUTING_PATTERNS.items():
-        keywords = config["keywords"]
-        weight = config.get("weight", 1)
-        
-        # Count keyword matches
-        match_count = sum(1 for kw in keywords if kw in q_lower)
-        
+        match_count = keyword_counts.get(route_type, 0)
         if match_count > 0:
-            route_scores[route_type] = match_count * weight
+            route_scores[route_type] = match_count * config.get("weight", 1)
     
     # If no specific route matched, use heuristics
     if not route_scores:
@@ -1,50 +1,132 @@
 """
 Test Plaid access token to diagnose issues
+
+Run directly for a diagnostic printout, or under pytest. Credentials come
+from PLAID_CLIENT_ID / PLAID_SECRET / PLAID_ENVIRONMENT. Under pytest the
+test replays the recorded cassette; it only talks to Plaid (and records the
+cassette) when PLAID_LIVE_TESTS=1. It is marked `live`, so
+`pytest -m "not live"` skips it entirely.
 """
+import contextlib
 import os
 import sys
 
-# Fix encoding for Windows
-if sys.stdout.encoding != 'utf-8':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
-from src.banking_api import PlaidBankingAPI
+# Fix encoding for Windows; line buffering keeps progress output live under pipes
+if hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace', line_buffering=True)
 
-# Read the access token from file
 try:
-    with open("access_token.txt", "r") as f:
-        access_token = f.read().strip()
-except FileNotFoundError:
-    print("ERROR: access_token.txt not found. Run get_plaid_token.py first")
-    exit(1)
-
-print(f"[INFO] Access Token: {access_token}")
-print(f"[INFO] Length: {len(access_token)} characters")
-print(f"[OK] Format check: {access_token.startswith('access-')}")
-
-# Try to use it
-print("\n[INFO] Testing Plaid API with access token...")
+    import pytest
+    live = pytest.mark.live
+except ImportError:
+    pytest = None
+    live = lambda func: func
+
+# vcrpy records/replays HTTP interactions (optional)
 try:
-    api = PlaidBankingAPI(
-        client_id="699208264c01cb002166c676",
-        secret="4fd746dbc01da40fa0595279a003e1",
-        environment="sandbox"
+    import vcr
+    VCR_AVAILABLE = True
+except ImportError:
+    VCR_AVAILABLE = False
+
+from src.banking_api import PlaidBankingAPI
+
+ACCESS_TOKEN_FILE = "access_token.txt"
+CASSETTE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "tests", "cassettes", "plaid_transactions.yaml"
+)
+
+
+def live_plaid_enabled():
+    return os.getenv("PLAID_LIVE_TESTS") == "1"
+
+
+def plaid_cassette(record=True):
+    """Record Plaid traffic once and replay it later, with credentials scrubbed."""
+    if not VCR_AVAILABLE:
+        return contextlib.nullcontext()
+    return vcr.use_cassette(
+        CASSETTE_PATH,
+        record_mode="new_episodes" if record else "none",
+        filter_headers=["PLAID-CLIENT-ID", "PLAID-SECRET"],
+        filter_post_data_parameters=["client_id", "secret", "access_token"],
+    )
+
+
+def read_access_token():
+    with open(ACCESS_TOKEN_FILE, "r") as f:
+        return f.read().strip()
+
+
+def make_api(**credentials):
+    # Credentials default to the PLAID_CLIENT_ID / PLAID_SECRET env vars
+    return PlaidBankingAPI(
+        environment=os.getenv("PLAID_ENVIRONMENT", "sandbox"),
+        **credentials
     )
-    
-    print("[OK] Plaid API initialized")
-    print("[INFO] Fetching transactions...")
-    
-    df = api.get_transactions(access_token, days_back=30)
-    
-    if df.empty:
-        print("[WARN] No transactions found (but API call succeeded!)")
+
+
+def fetch_transaction_chunks(api, access_token, days_back=30, record=True):
+    # The iterator pages lazily, so it is drained inside the cassette
+    with plaid_cassette(record=record):
+        return list(api.iter_transactions(access_token, days_back=days_back))
+
+
+@live
+def test_fetch_transactions():
+    pytest.importorskip("plaid")
+    if not os.path.exists(ACCESS_TOKEN_FILE):
+        pytest.skip("access_token.txt not found. Run get_plaid_token.py first")
+    live_run = live_plaid_enabled()
+    if not live_run:
+        if not VCR_AVAILABLE or not os.path.exists(CASSETTE_PATH):
+            pytest.skip("No recorded cassette; set PLAID_LIVE_TESTS=1 to record against Plaid")
+        # Replay only: dummy credentials, and any unrecorded request fails
+        api = make_api(client_id="replay", secret="replay")
     else:
-        print(f"[OK] Successfully fetched {len(df)} transactions")
-        print(f"\nColumns: {list(df.columns)}")
-        print(f"\nFirst few rows:\n{df.head()}")
-        
-except Exception as e:
-    print(f"[ERROR] {e}")
-    import traceback
-    traceback.print_exc()
+        if not (os.getenv("PLAID_CLIENT_ID") and os.getenv("PLAID_SECRET")):
+            pytest.skip("PLAID_CLIENT_ID / PLAID_SECRET not set")
+        api = make_api()
+    chunks = fetch_transaction_chunks(api, read_access_token(), record=live_run)
+    for chunk in chunks:
+        assert {"date", "amount", "description"} <= set(chunk.columns)
+
+
+if __name__ == "__main__":
+    # Read the access token from file
+    try:
+        access_token = read_access_token()
+    except FileNotFoundError:
+        print("ERROR: access_token.txt not found. Run get_plaid_token.py first")
+        exit(1)
+
+    print(f"[INFO] Access Token: {access_token}")
+    print(f"[INFO] Length: {len(access_token)} characters")
+    print(f"[OK] Format check: {access_token.startswith('access-')}")
+
+    # Try to use it
+    print("\n[INFO] Testing Plaid API with access token...")
+    try:
+        api = make_api()
+
+        print("[OK] Plaid API initialized")
+        print("[INFO] Fetching transactions...")
+
+        chunks = fetch_transaction_chunks(api, access_token, days_back=30)
+        # Count without concatenating the chunks into one frame
+        total = sum(len(chunk) for chunk in chunks)
+
+        if total == 0:
+            print("[WARN] No transactions found (but API call succeeded!)")
+        else:
+            print(f"[OK] Successfully fetched {total} transactions")
+            # Row preview only on request; capped to_string skips the full repr
+            if os.environ.get("VERBOSE"):
+                df = chunks[0]
+                print("\nColumns:", ",".join(df.columns))
+                print(df.head().to_string(max_colwidth=32, max_rows=5, index=False))
+
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        import traceback
+        traceback.print_exc()
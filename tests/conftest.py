@@ -0,0 +1,8 @@
+"""
+Shared pytest configuration: makes the modules in src/ importable.
+"""
+
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "src"))
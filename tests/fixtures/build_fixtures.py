@@ -0,0 +1,84 @@
+"""
+Build the tiny parquet fixtures used by the unit tests.
+
+Fixtures are written to a cache outside the source tree, under a filename
+that carries a hash of the builder's source, so editing a builder rebuilds
+its fixture. The tests build any missing fixture on first use; run this
+module directly to prebuild them.
+"""
+
+import hashlib
+import inspect
+import os
+import pathlib
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+FIXTURES_DIR = pathlib.Path(os.environ.get(
+    'FIXTURE_CACHE_DIR', pathlib.Path(tempfile.gettempdir()) / 'financial-insights-fixtures'
+))
+
+
+def _dataprep_frame():
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-02'], format='%Y-%m-%d', cache=True),
+        'amount': [100.0, -50.0, -50.0],
+        'description': ['Salary', 'Food', 'Food'],
+        'category': ['Income', 'Food & Dining', 'Food & Dining']
+    })
+    df['category'] = df['category'].astype('category')
+    df['description'] = df['description'].astype('category')
+    return df
+
+
+def _insights_frame():
+    df = pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', '2024-01-03'],
+        'amount': [1500.0, -50.0, -100.0],
+        'category': ['Income', 'Food & Dining', 'Utilities'],
+        'description': ['Salary', 'Restaurant', 'Electric Bill']
+    })
+    df['category'] = df['category'].astype('category')
+    df['description'] = df['description'].astype('category')
+    return df
+
+
+FIXTURES = {
+    'tiny_dataprep': _dataprep_frame,
+    'tiny_insights': _insights_frame,
+}
+
+
+def fixture_path(name):
+    """FIXTURES_DIR/<name>-<hash of the builder source and library versions>.parquet"""
+    key = hashlib.blake2b(inspect.getsource(FIXTURES[name]).encode(), digest_size=8)
+    key.update(f'{pd.__version__}/{pa.__version__}'.encode())
+    return FIXTURES_DIR / f'{name}-{key.hexdigest()}.parquet'
+
+
+def build_fixture(name):
+    """Write one fixture to its fixture_path() and return the path."""
+    path = fixture_path(name)
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(FIXTURES[name](), preserve_index=False)
+    # Write then rename, so parallel workers never read a half-written file
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def load_fixture(name):
+    """Read a fixture (memory-mapped), building it first if it is missing or stale."""
+    path = fixture_path(name)
+    if not path.exists():
+        build_fixture(name)
+    return pd.read_parquet(path, engine='pyarrow', memory_map=True)
+
+
+if __name__ == '__main__':
+    for fixture_name in FIXTURES:
+        print(build_fixture(fixture_name))
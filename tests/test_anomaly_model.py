@@ -2,53 +2,168 @@
 Unit tests for anomaly detection module.
 """
 
+import hashlib
+import os
+import pathlib
 import unittest
+import joblib
 import numpy as np
-import sys
-sys.path.insert(0, '../src')
+import pandas as pd
+import pytest
+import sklearn
 
+import anomaly_kernels
+import anomaly_model
 from anomaly_model import AnomalyDetector
 
+CACHE_DIR = pathlib.Path(__file__).resolve().parent / ".cache"
 
+
+def _code_digest():
+    """Hash of the detector's source and library versions; any change invalidates cached fits."""
+    digest = hashlib.blake2b(digest_size=8)
+    for module in (anomaly_model, anomaly_kernels):
+        digest.update(pathlib.Path(module.__file__).read_bytes())
+    digest.update(f"{np.__version__}/{sklearn.__version__}".encode())
+    return digest.digest()
+
+
+def fit_cached(detector, X):
+    """
+    Fit detector on X, or with IFOREST_CACHE=1 load a previous fit of the
+    same code, configuration and data from tests/.cache.
+    """
+    if os.environ.get("IFOREST_CACHE") != "1":
+        return detector.fit(X)
+    key = hashlib.blake2b(X.tobytes(), digest_size=8)
+    key.update(_code_digest())
+    key.update(repr((detector.method, detector.contamination, detector.n_estimators,
+                     detector.random_state)).encode())
+    path = CACHE_DIR / f"{detector.method}_{key.hexdigest()}.joblib"
+    if path.exists():
+        return joblib.load(path)
+    CACHE_DIR.mkdir(exist_ok=True)
+    detector.fit(X)
+    joblib.dump(detector, path, compress=3)
+    return detector
+
+
+# Model fits dominate the suite's wall time: schedule this class first
+@pytest.mark.slow
+@pytest.mark.order(1)
 class TestAnomalyDetector(unittest.TestCase):
     """Test cases for anomaly detection model."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create synthetic data with some outliers
-        normal_data = np.random.normal(100, 20, (100, 1))
-        outliers = np.array([[500], [600], [700]])
-        self.X_train = np.vstack([normal_data, outliers])
+    @classmethod
+    def setUpClass(cls):
+        """Build the training data and fit one shared detector."""
+        # Synthetic data with some outliers, seeded for reproducibility
+        rng = np.random.default_rng(42)
+        cls.X_train = np.empty((103, 1), dtype=np.float64)
+        cls.X_train[:100, 0] = rng.normal(100, 20, 100)
+        cls.X_train[100:, 0] = [500, 600, 700]
         
-        self.detector = AnomalyDetector(contamination=0.05)
+        cls.fitted_detector = fit_cached(AnomalyDetector(contamination=0.05), cls.X_train)
     
     def test_fit_model(self):
         """Test that model can be fitted."""
-        self.detector.fit(self.X_train)
-        self.assertTrue(self.detector.is_fitted)
+        self.assertTrue(self.fitted_detector.is_fitted)
     
     def test_predict_before_fit_raises_error(self):
         """Test that prediction before fitting raises error."""
+        detector = AnomalyDetector(contamination=0.05)
         with self.assertRaises(ValueError):
-            self.detector.predict(self.X_train)
+            detector.predict(self.X_train)
     
     def test_predict_returns_correct_shape(self):
         """Test that predictions have correct shape."""
-        self.detector.fit(self.X_train)
-        predictions = self.detector.predict(self.X_train)
+        predictions = self.fitted_detector.predict(self.X_train)
         self.assertEqual(predictions.shape[0], self.X_train.shape[0])
+        
+        # Large input goes through the chunked, threaded IsolationForest path
+        X_large = np.resize(self.X_train, (100_000, 1))
+        iforest = fit_cached(AnomalyDetector(contamination=0.05, method="iforest"), self.X_train)
+        predictions = iforest.predict(X_large)
+        self.assertEqual(predictions.shape[0], X_large.shape[0])
+        np.testing.assert_array_equal(predictions[:103], iforest.predict(self.X_train))
     
     def test_anomaly_scores_shape(self):
         """Test that anomaly scores have correct shape."""
-        self.detector.fit(self.X_train)
-        scores = self.detector.get_anomaly_scores(self.X_train)
+        scores = self.fitted_detector.get_anomaly_scores(self.X_train)
         self.assertEqual(scores.shape[0], self.X_train.shape[0])
     
     def test_fit_predict(self):
         """Test fit_predict method."""
-        predictions = self.detector.fit_predict(self.X_train)
+        detector = AnomalyDetector(contamination=0.05)
+        predictions = detector.fit_predict(self.X_train)
         self.assertEqual(predictions.shape[0], self.X_train.shape[0])
-        self.assertTrue(self.detector.is_fitted)
+        self.assertTrue(detector.is_fitted)
+
+    def test_mad_flags_injected_outliers(self):
+        """Test that the default MAD detector flags the injected outliers as the most anomalous."""
+        self.assertEqual(self.fitted_detector.method, "mad")
+        predictions = self.fitted_detector.predict(self.X_train)
+        np.testing.assert_array_equal(predictions[100:], [-1, -1, -1])
+        self.assertLessEqual(np.sum(predictions == -1), int(np.ceil(0.05 * len(self.X_train))))
+        scores = self.fitted_detector.get_anomaly_scores(self.X_train)
+        self.assertEqual(set(np.argsort(scores)[:3]), {100, 101, 102})
+        self.assertTrue(self.fitted_detector.is_anomaly({"amount": 650.0}))
+        self.assertFalse(self.fitted_detector.is_anomaly({"amount": 100.0}))
+
+    def test_is_anomaly_lookup_matches_forest(self):
+        """Test that the iforest interval lookup agrees with decision_function < 0 on every amount."""
+        iforest = fit_cached(AnomalyDetector(contamination=0.05, method="iforest"), self.X_train)
+        thresholds = np.unique(np.concatenate([
+            est.tree_.threshold[est.tree_.feature >= 0] for est in iforest.model.estimators_
+        ]))
+        # Sweep a dense grid plus the split thresholds themselves and their float32 neighbours
+        amounts = np.concatenate([
+            np.linspace(-100, 900, 5_001, dtype=np.float32),
+            thresholds.astype(np.float32),
+            np.nextafter(thresholds.astype(np.float32), np.float32(np.inf)),
+            np.nextafter(thresholds.astype(np.float32), np.float32(-np.inf)),
+        ])
+        expected = iforest.model.decision_function(amounts.reshape(-1, 1)) < 0
+        np.testing.assert_array_equal(expected, iforest.model.predict(amounts.reshape(-1, 1)) == -1)
+        actual = [iforest.is_anomaly({"amount": float(a)}) for a in amounts]
+        np.testing.assert_array_equal(actual, expected)
+
+    def test_score_inplace_adds_columns_to_caller_frame(self):
+        """Test that score() adds its columns to the caller's frame by default, and to a copy with inplace=False."""
+        df = pd.DataFrame({"amount": self.X_train[:, 0], "description": "x"})
+        result = anomaly_model.score_transactions(self.fitted_detector, df)
+        self.assertIs(result, df)
+        self.assertEqual(list(df.columns), ["amount", "description", "anomaly_score", "is_anomaly"])
+        np.testing.assert_array_equal(df["is_anomaly"], self.fitted_detector.predict(self.X_train) == -1)
+
+        df = pd.DataFrame({"amount": self.X_train[:, 0]})
+        result = self.fitted_detector.score(df, inplace=False)
+        self.assertIsNot(result, df)
+        self.assertEqual(list(df.columns), ["amount"])
+        self.assertIn("anomaly_score", result.columns)
+
+
+class TestScoreZ(unittest.TestCase):
+    """Test cases for the MAD z-score kernel."""
+
+    def setUp(self):
+        """Amounts with a known z-score each, and a missing one."""
+        self.x = np.array([90.0, 100.0, 130.0, 70.0, np.nan], dtype=np.float32)
+
+    def test_scores_and_flags(self):
+        """Test that scores are -|x - med| / mad and flags are z > cut, with NaN not anomalous."""
+        scores, flags = anomaly_kernels.score_z(self.x, 100.0, 0.1, 2.0)
+        self.assertEqual(scores.dtype, np.float32)
+        np.testing.assert_allclose(scores, [-1.0, 0.0, -3.0, -3.0, np.nan], rtol=1e-6)
+        np.testing.assert_array_equal(flags, [False, False, True, True, False])
+
+    def test_matches_numpy_fallback(self):
+        """Test that the compiled kernel, when present, agrees with the NumPy path."""
+        x = np.random.default_rng(0).normal(100, 20, 10_000).astype(np.float32)
+        scores, flags = anomaly_kernels.score_z(x, 100.0, 1 / 13.5, 2.5)
+        ref_scores, ref_flags = anomaly_kernels._score_z_numpy(x, 100.0, 1 / 13.5, 2.5)
+        np.testing.assert_allclose(scores, ref_scores, rtol=1e-5)
+        np.testing.assert_array_equal(flags, ref_flags)
 
 
 if __name__ == '__main__':
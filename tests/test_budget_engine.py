@@ -0,0 +1,50 @@
+"""
+Unit tests for budget engine module.
+"""
+
+import unittest
+import pandas as pd
+
+from budget_engine import BudgetRecommendationEngine
+
+
+class TestBudgetEngine(unittest.TestCase):
+    """Test cases for budget recommendations."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.df = pd.DataFrame({
+            'date': ['2024-01-05', '2024-02-10', '2024-03-15', '2024-04-20', '2024-04-25'],
+            'amount': [-300.0, -90.0, -60.0, -30.0, -45.0],
+            'category': ['Groceries', 'Groceries', 'Fuel', 'Groceries', 'Fuel'],
+        })
+        self.engine = BudgetRecommendationEngine()
+
+    def test_recommend_budget_uses_recent_months(self):
+        """Test that only the last `months` of spending are averaged."""
+        budget = self.engine.recommend_budget(self.df, months=3)
+        self.assertEqual(budget, {'Groceries': 40.0, 'Fuel': 35.0})
+
+    def test_recommend_budget_unsorted_dates(self):
+        """Test that rows out of date order give the same recommendation."""
+        shuffled = self.df.iloc[[3, 0, 4, 2, 1]]
+        self.assertEqual(
+            self.engine.recommend_budget(shuffled, months=3),
+            self.engine.recommend_budget(self.df, months=3),
+        )
+
+    def test_recommend_budget_tz_aware_dates(self):
+        """Test that tz-aware dates work, sorted or not."""
+        expected = self.engine.recommend_budget(self.df, months=3)
+        aware = self.df.assign(date=pd.to_datetime(self.df['date']).dt.tz_localize('Europe/London'))
+        self.assertEqual(self.engine.recommend_budget(aware, months=3), expected)
+        self.assertEqual(self.engine.recommend_budget(aware.iloc[[3, 0, 4, 2, 1]], months=3), expected)
+
+    def test_recommend_budget_requested_categories(self):
+        """Test that requested categories without spending get a zero budget."""
+        budget = self.engine.recommend_budget(self.df, categories=['Fuel', 'Travel'], months=3)
+        self.assertEqual(budget, {'Fuel': 35.0, 'Travel': 0.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
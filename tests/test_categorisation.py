@@ -0,0 +1,44 @@
+"""
+Unit tests for categorisation module.
+"""
+
+import unittest
+import pandas as pd
+
+from categorisation import categorise, categorise_series
+
+
+class TestCategorisation(unittest.TestCase):
+    """Test cases for keyword categorization."""
+
+    def test_categorise_series_uses_category_map_priority(self):
+        """Test that the keyword listed first in CATEGORY_MAP wins, not the leftmost match."""
+        descriptions = pd.Series(["Gas Station Shell", "PIZZA HUT VIA UBER", "Netflix on Amazon"])
+        result = categorise_series(descriptions)
+        self.assertEqual(list(result), ["Fuel", "Transport", "Shopping"])
+
+    def test_categorise_series_matches_categorise(self):
+        """Test that the Series path agrees with categorise() row by row."""
+        descriptions = pd.Series(
+            ["TESCO STORES", "Starbucks", "CVS Pharmacy", "Netflix.com", "unknown shop", "", None],
+            index=[10, 11, 12, 13, 14, 15, 16],
+        )
+        result = categorise_series(descriptions)
+        expected = [categorise(d) for d in descriptions]
+        self.assertEqual(list(result), expected)
+        self.assertEqual(list(result.index), list(descriptions.index))
+
+    def test_categorise_missing_values(self):
+        """Test that missing descriptions are 'Other' on the scalar path too."""
+        self.assertEqual(categorise(None), "Other")
+        self.assertEqual(categorise(float("nan")), "Other")
+
+    def test_categorise_series_repeated_descriptions(self):
+        """Test that repeated descriptions all get the same category."""
+        descriptions = pd.Series(["Shell", "shell", "Amazon", "Shell"])
+        result = categorise_series(descriptions)
+        self.assertEqual(list(result), ["Fuel", "Fuel", "Shopping", "Fuel"])
+
+
+if __name__ == '__main__':
+    unittest.main()
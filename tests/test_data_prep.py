@@ -4,29 +4,49 @@ Unit tests for data preparation module.
 
 import unittest
 import pandas as pd
-import sys
-sys.path.insert(0, '../src')
 
 from data_prep import clean_data, prepare_features
+from fixtures.build_fixtures import load_fixture
 
 
 class TestDataPrep(unittest.TestCase):
     """Test cases for data preparation functions."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Load the fixture frame once from parquet."""
+        cls.base_df = load_fixture('tiny_dataprep')
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.df = pd.DataFrame({
-            'date': ['2024-01-01', '2024-01-02', '2024-01-02'],
-            'amount': [100.0, -50.0, -50.0],
-            'description': ['Salary', 'Food', 'Food'],
-            'category': ['Income', 'Food & Dining', 'Food & Dining']
-        })
+        # Shallow copy: tests get their own frame over the shared buffers
+        self.df = self.base_df.copy(deep=False)
     
     def test_clean_data_removes_duplicates(self):
         """Test that clean_data removes duplicate rows."""
         cleaned = clean_data(self.df)
         self.assertEqual(len(cleaned), 2)
     
+    def test_clean_data_dedups_wide_frame_on_subset(self):
+        """Test that duplicates are found on the dedup subset of a wide frame."""
+        wide = self.df.drop(columns=['category'])
+        for i in range(10):
+            wide[f'extra_{i}'] = [i, i + 1, i + 2]
+        wide.loc[3] = [self.df['date'].iloc[0], 100.0, 'Salary'] + list(range(10))
+        cleaned = clean_data(wide)
+        self.assertEqual(len(cleaned), 2)
+        self.assertEqual(list(cleaned.index), [0, 1])
+    
+    def test_clean_data_explicit_subset(self):
+        """Test that an explicit dedup subset decides which rows are duplicates."""
+        cleaned = clean_data(self.df, dedup_subset=['description'])
+        self.assertEqual(list(cleaned['description']), ['Salary', 'Food'])
+    
+    def test_clean_data_missing_subset_column_raises(self):
+        """Test that a dedup subset naming a missing column raises a clear KeyError."""
+        with self.assertRaisesRegex(KeyError, 'merchant'):
+            clean_data(self.df, dedup_subset=['date', 'merchant'])
+    
     def test_clean_data_converts_date(self):
         """Test that clean_data converts date to datetime."""
         cleaned = clean_data(self.df)
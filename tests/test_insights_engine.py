@@ -3,25 +3,21 @@ Unit tests for insights engine module.
 """
 
 import unittest
+import numpy as np
 import pandas as pd
-import sys
-sys.path.insert(0, '../src')
 
 from insights_engine import InsightsEngine
+from fixtures.build_fixtures import load_fixture
 
 
 class TestInsightsEngine(unittest.TestCase):
     """Test cases for insights engine."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.df = pd.DataFrame({
-            'date': ['2024-01-01', '2024-01-02', '2024-01-03'],
-            'amount': [1500.0, -50.0, -100.0],
-            'category': ['Income', 'Food & Dining', 'Utilities'],
-            'description': ['Salary', 'Restaurant', 'Electric Bill']
-        })
-        self.engine = InsightsEngine(self.df)
+    @classmethod
+    def setUpClass(cls):
+        """Load the fixture frame once from parquet."""
+        cls.df = load_fixture('tiny_insights')
+        cls.engine = InsightsEngine(cls.df)
     
     def test_get_summary_statistics(self):
         """Test summary statistics calculation."""
@@ -30,18 +26,42 @@ class TestInsightsEngine(unittest.TestCase):
         self.assertEqual(stats['total_expenses'], 150.0)
         self.assertEqual(stats['net_flow'], 1350.0)
     
+    def test_get_summary_statistics_large_frame(self):
+        """Test summary statistics on a large synthetic frame."""
+        rng = np.random.default_rng(42)
+        amounts = pd.Series(rng.normal(0, 500, 100_000))
+        stats = InsightsEngine(pd.DataFrame({'amount': amounts})).get_summary_statistics()
+        # Summation order differs from pandas: compare with a relative tolerance
+        np.testing.assert_allclose(stats['total_income'], amounts[amounts > 0].sum(), rtol=1e-9)
+        np.testing.assert_allclose(stats['total_expenses'], -amounts[amounts < 0].sum(), rtol=1e-9)
+        np.testing.assert_allclose(stats['net_flow'], amounts.sum(), rtol=1e-9)
+    
     def test_get_category_breakdown(self):
         """Test category breakdown calculation."""
         breakdown = self.engine.get_category_breakdown()
         self.assertIn('Food & Dining', breakdown)
         self.assertIn('Utilities', breakdown)
     
+    def test_get_category_breakdown_categorical_keys(self):
+        """Test that a categorical category column yields plain str keys."""
+        breakdown = self.engine.get_category_breakdown()
+        self.assertTrue(all(type(key) is str for key in breakdown))
+        self.assertEqual(breakdown['Utilities'], -100.0)
+    
     def test_get_top_transactions(self):
         """Test getting top transactions."""
         top = self.engine.get_top_transactions(n=2)
         self.assertEqual(len(top), 2)
         self.assertEqual(top.iloc[0]['amount'], 1500.0)
     
+    def test_get_top_transactions_large_frame(self):
+        """Test top transactions on a large frame against a sorted reference."""
+        rng = np.random.default_rng(42)
+        amounts = rng.normal(0, 500, 50_000)
+        engine = InsightsEngine(pd.DataFrame({'amount': amounts}))
+        top = engine.get_top_transactions(n=10)
+        self.assertEqual(list(top['amount']), sorted(amounts, reverse=True)[:10])
+    
     def test_get_insights_returns_list(self):
         """Test that insights are returned as a list."""
         insights = self.engine.get_insights()
@@ -0,0 +1,126 @@
+"""
+Unit tests for NLP query routing module.
+"""
+
+import unittest
+import pandas as pd
+
+from advanced_nlp import HybridNLPRouter
+from nlp_router import extract_category_from_dataframe, route_query, search_transactions
+
+
+class TestCategoryExtraction(unittest.TestCase):
+    """Test cases for matching queries against the frame's categories."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.df = pd.DataFrame({
+            'date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']),
+            'amount': [-20.0, -35.0, -12.5, -60.0],
+            'description': ['Tesco', 'Corner Shop', 'Pizza Place', 'Shell'],
+            'category': ['Groceries', 'Other Groceries', 'Food & Dining', 'Fuel'],
+        })
+
+    def test_longest_contained_category_wins(self):
+        """Test that the longest category name in the query beats a shorter one it contains."""
+        self.assertEqual(
+            extract_category_from_dataframe('how much on other groceries', self.df), 'Other Groceries'
+        )
+        self.assertEqual(extract_category_from_dataframe('how much on groceries', self.df), 'Groceries')
+
+    def test_contained_category_beats_word_match(self):
+        """Test that a full category name wins over an earlier category matched by one word."""
+        self.assertEqual(extract_category_from_dataframe('food and groceries', self.df), 'Groceries')
+
+    def test_word_match_when_no_full_name(self):
+        """Test that a single word of a category name matches when no full name does."""
+        self.assertEqual(extract_category_from_dataframe('dining out last week', self.df), 'Food & Dining')
+
+    def test_no_category_match(self):
+        """Test that an unrelated query matches no category."""
+        self.assertIsNone(extract_category_from_dataframe('xyzzy', self.df))
+
+    def test_route_query_returns_category_params(self):
+        """Test that a category found in the frame routes to CATEGORY with that category."""
+        route, params = route_query('spending on other groceries', self.df)
+        self.assertEqual(route, 'CATEGORY')
+        self.assertEqual(params, {'query': 'spending on other groceries', 'category': 'Other Groceries'})
+
+    def test_index_tracks_changed_frame(self):
+        """Test that categories added to a frame are picked up on the next query."""
+        self.assertIsNone(extract_category_from_dataframe('travel costs', self.df))
+        self.df.loc[len(self.df)] = [pd.Timestamp('2024-01-05'), -80.0, 'Rail', 'Travel']
+        self.assertEqual(extract_category_from_dataframe('travel costs', self.df), 'Travel')
+
+
+class TestSearchTransactions(unittest.TestCase):
+    """Test cases for free-text transaction search."""
+
+    def test_matches_terms_case_insensitively(self):
+        """Test that terms match any part of a value, ignoring case."""
+        df = pd.DataFrame({
+            'amount': [-20.0, -5.0, -30.0, -7.0],
+            'description': ['TESCO STORES', None, 'Amazon', 'tesco express'],
+        })
+        result = search_transactions('tesco purchases', df)
+        self.assertEqual(list(result.index), [0, 3])
+
+    def test_no_match_returns_none(self):
+        """Test that a search with no hits returns None."""
+        df = pd.DataFrame({'amount': [-20.0], 'description': ['Amazon']})
+        self.assertIsNone(search_transactions('tesco', df))
+
+
+class TestKeywordRouting(unittest.TestCase):
+    """Test cases for keyword-based routing without a DataFrame."""
+
+    def test_keywords_scored_by_weight(self):
+        """Test that routes are scored by keyword count times weight."""
+        route, params = route_query('show the trend over time')
+        self.assertEqual(route, 'TREND')
+        self.assertEqual(params['route_score'], 16)
+
+    def test_repeated_keyword_counts_once(self):
+        """Test that a keyword occurring twice counts once."""
+        route, params = route_query('trend trend summary')
+        self.assertEqual(route, 'TREND')
+        self.assertEqual(params['route_score'], 8)
+
+    def test_tie_resolves_in_pattern_order(self):
+        """Test that equal scores resolve to the route listed first in ROUTING_PATTERNS."""
+        route, _ = route_query('unusual category')
+        self.assertEqual(route, 'CATEGORY')
+
+    def test_empty_query_is_summary(self):
+        """Test that an empty query routes to SUMMARY."""
+        self.assertEqual(route_query('   '), ('SUMMARY', {}))
+
+
+class TestHybridKeywordRouting(unittest.TestCase):
+    """Test cases for HybridNLPRouter's keyword fallback (no models loaded)."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one router; its models are never loaded here."""
+        cls.router = HybridNLPRouter()
+
+    def test_routes_on_keyword(self):
+        """Test that a query routes on the keyword it contains, ignoring case."""
+        self.assertEqual(self.router.route_query('Give me a category breakdown'), ('CATEGORY', {}))
+        self.assertEqual(self.router.route_query('ANOMALIES please'), ('ANOMALIES', {}))
+
+    def test_first_route_in_order_wins(self):
+        """Test that the first route in keyword_routes with a keyword in the query wins,
+        wherever its keyword occurs."""
+        self.assertEqual(self.router.route_query('show the spending breakdown')[0], 'CATEGORY')
+        self.assertEqual(self.router.route_query('total spending over time')[0], 'SUMMARY')
+        self.assertEqual(self.router.route_query('is my health score improving over time')[0], 'HEALTH')
+        self.assertEqual(self.router.route_query('spending by month')[0], 'CATEGORY')
+
+    def test_unmatched_query_is_unknown(self):
+        """Test that a query with no keyword routes to UNKNOWN."""
+        self.assertEqual(self.router.route_query('hello there'), ('UNKNOWN', {}))
+
+
+if __name__ == '__main__':
+    unittest.main()